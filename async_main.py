@@ -276,8 +276,17 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Prefer uvloop's libuv-based event loop when available (it does not support Windows).
+    # Passing it as the loop factory avoids the global event loop policy uvloop.install() sets.
     try:
-        exit_code = asyncio.run(main())
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+    
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            exit_code = runner.run(main())
         sys.exit(exit_code)
     except KeyboardInterrupt:
         logger.info("Application interrupted by user")
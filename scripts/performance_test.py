@@ -11,14 +11,63 @@ import aiohttp
 import time
 import statistics
 import json
+import os
 import psutil
 import subprocess
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import concurrent.futures
+import numpy as np
 
-@dataclass
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# uvloop is optional and unavailable on Windows; fall back to the default loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Sample count above which the numba-fused summary is used (soak tests)
+JIT_SUMMARY_THRESHOLD = 100_000
+
+
+def summarize_response_times(response_times: np.ndarray) -> Tuple[float, float, float, float]:
+    """Compute (mean, min, max, p95) with a single O(n) selection pass."""
+    if _summarize_jit is not None and len(response_times) >= JIT_SUMMARY_THRESHOLD:
+        mean, min_r, max_r, p95 = _summarize_jit(np.ascontiguousarray(response_times, dtype=np.float64))
+        return float(mean), float(min_r), float(max_r), float(p95)
+    
+    last = len(response_times) - 1
+    k95 = int(0.95 * last)
+    part = np.partition(response_times, [0, k95, last])
+    return float(response_times.mean()), float(part[0]), float(part[last]), float(part[k95])
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _summarize_jit(a):
+        """Fused mean/min/max loop plus P95 selection, compiled with numba."""
+        total = 0.0
+        min_r = a[0]
+        max_r = a[0]
+        for x in a:
+            total += x
+            if x < min_r:
+                min_r = x
+            if x > max_r:
+                max_r = x
+        k95 = int(0.95 * (len(a) - 1))
+        p95 = np.partition(a, k95)[k95]
+        return total / len(a), min_r, max_r, p95
+else:
+    _summarize_jit = None
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Container for performance measurement results."""
     test_name: str
@@ -34,6 +83,15 @@ class PerformanceMetrics:
     memory_usage_mb: float
     cpu_usage_percent: float
 
+def _run(coro):
+    """Run a coroutine on a fresh event loop, using uvloop when it is installed."""
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+        return runner.run(coro)
+
+def _load_worker(shard: Dict) -> Tuple[np.ndarray, int, List[str]]:
+    """Run one shard of a load test on its own event loop (process pool entry point)."""
+    return _run(PerformanceTester().collect_response_times(**shard))
+
 class PerformanceTester:
     """
     Comprehensive performance testing suite for Project Synapse.
@@ -46,13 +104,16 @@ class PerformanceTester:
     - Resource scaling characteristics
     """
     
-    def __init__(self):
+    def __init__(self, load_processes: int = 1):
+        # Number of processes the load generator is sharded across
+        self.load_processes = load_processes
+        
         self.endpoints = {
-            "primary_health": "http://localhost:8001/health",
-            "filesystem_health": "http://localhost:8002/health", 
-            "primary_search": "http://localhost:8001/tools/search_web",
-            "filesystem_save": "http://localhost:8002/tools/save_file",
-            "rabbitmq_overview": "http://localhost:15672/api/overview"
+            "primary_health": "http://127.0.0.1:8001/health",
+            "filesystem_health": "http://127.0.0.1:8002/health", 
+            "primary_search": "http://127.0.0.1:8001/tools/search_web",
+            "filesystem_save": "http://127.0.0.1:8002/tools/save_file",
+            "rabbitmq_overview": "http://127.0.0.1:15672/api/overview"
         }
         
         self.test_payloads = {
@@ -110,19 +171,16 @@ class PerformanceTester:
         except Exception:
             return 0.0, 0.0
 
-    async def run_load_test(self, test_name: str, url: str, method: str = "GET",
-                          payload: Optional[Dict] = None, auth: Optional[aiohttp.BasicAuth] = None,
-                          concurrent_requests: int = 10, total_requests: int = 100) -> PerformanceMetrics:
-        """Run load test against specific endpoint."""
-        print(f"  🔄 Running {test_name} ({concurrent_requests} concurrent, {total_requests} total)")
-        
-        response_times = []
+    async def collect_response_times(self, url: str, method: str = "GET",
+                                     payload: Optional[Dict] = None, auth: Optional[aiohttp.BasicAuth] = None,
+                                     concurrent_requests: int = 10,
+                                     total_requests: int = 100) -> Tuple[np.ndarray, int, List[str]]:
+        """Issue requests in this process and return (durations, successes, errors)."""
+        response_times = np.empty(total_requests, dtype=np.float64)
+        completed_requests = 0
         errors = []
         successful_requests = 0
         
-        start_time = time.time()
-        start_memory, start_cpu = self.get_system_metrics()
-        
         # Create semaphore to limit concurrent requests
         semaphore = asyncio.Semaphore(concurrent_requests)
         
@@ -136,23 +194,74 @@ class PerformanceTester:
         # Run all requests
         async with aiohttp.ClientSession(
             timeout=aiohttp.ClientTimeout(total=30),
-            connector=aiohttp.TCPConnector(limit=50)
+            connector=aiohttp.TCPConnector(
+                limit=concurrent_requests * 2,
+                limit_per_host=concurrent_requests * 2,
+                keepalive_timeout=120,
+                force_close=False,
+                use_dns_cache=True,
+                ttl_dns_cache=3600
+            )
         ) as session:
             tasks = [bounded_request(session) for _ in range(total_requests)]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        for result in results:
-            if isinstance(result, Exception):
-                errors.append(str(result))
-            else:
-                duration, success, error = result
-                response_times.append(duration)
+            
+            # Process results as they complete instead of materializing them all
+            for future in asyncio.as_completed(tasks):
+                try:
+                    duration, success, error = await future
+                except Exception as e:
+                    if len(errors) < 10:
+                        errors.append(str(e))
+                    continue
+                
+                response_times[completed_requests] = duration
+                completed_requests += 1
                 if success:
                     successful_requests += 1
-                elif error:
+                elif error and len(errors) < 10:
                     errors.append(error)
         
+        return response_times[:completed_requests], successful_requests, errors
+
+    async def run_load_test(self, test_name: str, url: str, method: str = "GET",
+                          payload: Optional[Dict] = None, auth: Optional[aiohttp.BasicAuth] = None,
+                          concurrent_requests: int = 10, total_requests: int = 100) -> PerformanceMetrics:
+        """Run load test against specific endpoint."""
+        processes = max(1, min(self.load_processes, concurrent_requests, total_requests))
+        print(f"  🔄 Running {test_name} ({concurrent_requests} concurrent, {total_requests} total, "
+              f"{processes} process{'es' if processes > 1 else ''})")
+        
+        start_time = time.time()
+        start_memory, start_cpu = self.get_system_metrics()
+        
+        if processes == 1:
+            response_times, successful_requests, errors = await self.collect_response_times(
+                url, method, payload, auth, concurrent_requests, total_requests
+            )
+        else:
+            # Shard the load across worker processes so the generator isn't GIL-bound
+            shards = [
+                {
+                    "url": url,
+                    "method": method,
+                    "payload": payload,
+                    "auth": auth,
+                    "concurrent_requests": concurrent_requests // processes + (i < concurrent_requests % processes),
+                    "total_requests": total_requests // processes + (i < total_requests % processes)
+                }
+                for i in range(processes)
+            ]
+            
+            loop = asyncio.get_running_loop()
+            with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+                shard_results = await asyncio.gather(*[
+                    loop.run_in_executor(executor, _load_worker, shard) for shard in shards
+                ])
+            
+            response_times = np.concatenate([times for times, _, _ in shard_results])
+            successful_requests = sum(successes for _, successes, _ in shard_results)
+            errors = [error for _, _, shard_errors in shard_results for error in shard_errors][:10]
+        
         end_time = time.time()
         end_memory, end_cpu = self.get_system_metrics()
         
@@ -161,11 +270,10 @@ class PerformanceTester:
         avg_memory = (start_memory + end_memory) / 2
         avg_cpu = (start_cpu + end_cpu) / 2
         
-        if response_times:
-            avg_response = statistics.mean(response_times)
-            min_response = min(response_times)
-            max_response = max(response_times)
-            p95_response = statistics.quantiles(response_times, n=20)[18] if len(response_times) > 5 else max_response
+        if len(response_times):
+            avg_response, min_response, max_response, p95_response = summarize_response_times(
+                response_times
+            )
         else:
             avg_response = min_response = max_response = p95_response = 0.0
         
@@ -182,7 +290,7 @@ class PerformanceTester:
             p95_response_time=p95_response,
             requests_per_second=rps,
             success_rate=success_rate,
-            errors=errors[:10],  # Limit to first 10 errors
+            errors=errors,  # Capped at first 10 errors during collection
             memory_usage_mb=avg_memory,
             cpu_usage_percent=avg_cpu
         )
@@ -328,7 +436,7 @@ async def main():
     print("Phase 2: Performance Optimization & Baseline Establishment")
     print("=" * 60)
     
-    tester = PerformanceTester()
+    tester = PerformanceTester(load_processes=int(os.getenv("PERF_LOAD_PROCESSES", "1")))
     
     # Run performance tests
     start_time = time.time()
@@ -374,5 +482,5 @@ async def main():
     return True
 
 if __name__ == "__main__":
-    success = asyncio.run(main())
+    success = _run(main())
     exit(0 if success else 1)
@@ -0,0 +1,45 @@
+"""
+TTL Cache
+
+Small LRU cache shared by agents that memoize MCP tool results.
+Expiry uses the running event loop's clock, so it must be used from
+within the loop.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small LRU cache whose entries expire ``ttl`` seconds after being stored.
+    """
+    
+    __slots__ = ("maxsize", "ttl", "_entries")
+    
+    def __init__(self, maxsize: int = 512, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= asyncio.get_running_loop().time():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store ``value`` under ``key``, evicting the least recently used entry."""
+        self._entries[key] = (asyncio.get_running_loop().time() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
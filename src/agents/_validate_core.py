@@ -0,0 +1,54 @@
+"""
+Claim Validation Core
+
+Pure, fully annotated claim-scoring heuristics used by the fact checker.
+Kept free of agent state so the module can be compiled ahead of time with
+mypyc (``mypyc src/agents/_validate_core.py``); the interpreted module is
+used unchanged when no compiled extension is present.
+"""
+
+import re
+from typing import FrozenSet, Pattern, Tuple
+
+# Vocabularies used by the mock claim validator
+CRYPTO_TERMS: FrozenSet[str] = frozenset({"quantum", "encryption", "cryptography"})
+TECH_TERMS: FrozenSet[str] = frozenset({"algorithm", "computer", "technology"})
+BREAK_TERMS: FrozenSet[str] = frozenset({"break", "obsolete"})
+NIST_TERMS: FrozenSet[str] = frozenset({"nist", "standard"})
+
+
+def _compile_terms(terms: FrozenSet[str]) -> Pattern[str]:
+    """Compile a vocabulary into one case-insensitive substring matcher."""
+    return re.compile("|".join(re.escape(term) for term in sorted(terms)), re.IGNORECASE)
+
+
+_CRYPTO_TERMS_RE = _compile_terms(CRYPTO_TERMS)
+_TECH_TERMS_RE = _compile_terms(TECH_TERMS)
+_BREAK_TERMS_RE = _compile_terms(BREAK_TERMS)
+_NIST_TERMS_RE = _compile_terms(NIST_TERMS)
+
+
+def classify(claim: str) -> Tuple[bool, float, str]:
+    """
+    Score a claim using the mock validation heuristics.
+    
+    Args:
+        claim: The claim to validate
+        
+    Returns:
+        Tuple of (is_valid, confidence_score, evidence)
+    """
+    if _CRYPTO_TERMS_RE.search(claim):
+        if _BREAK_TERMS_RE.search(claim):
+            return True, 0.85, "Supported by multiple cryptographic research papers"
+        elif _NIST_TERMS_RE.search(claim):
+            return True, 0.92, "Confirmed by NIST standardization process"
+        else:
+            return True, 0.75, "Generally supported by current research"
+            
+    elif _TECH_TERMS_RE.search(claim):
+        return True, 0.80, "Consistent with current technological understanding"
+        
+    else:
+        # Generic validation for other claims
+        return True, 0.65, "Claim appears plausible but requires further verification"
@@ -9,8 +9,11 @@ import asyncio
 import logging
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Any, Set, Tuple
 import aiohttp
+import orjson
 from urllib.parse import urljoin
 
 # Prometheus monitoring
@@ -22,6 +25,58 @@ from ..protocols.acp_schema import ACPMessage, ACPMsgType
 
 logger = logging.getLogger(__name__)
 
+# Request headers for MCP tool calls whose JSON body is pre-encoded with orjson
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Pre-encoded STATUS_UPDATE envelope; only the variable fields are spliced in
+_STATUS_UPDATE_TEMPLATE = (
+    b'{"sender_id":%s,"receiver_id":%s,"topic":null,"msg_type":"status_update",'
+    b'"payload":{"status":%s,"progress":%s,"task_id":%s},"timestamp":null}'
+)
+
+# Inbox holds taken on the current call chain; tasks created under a hold inherit it
+_inbox_holds: ContextVar[frozenset] = ContextVar("inbox_holds", default=frozenset())
+
+
+def _log_broadcast_threshold() -> int:
+    """Read the minimum LOG_BROADCAST level from ACP_LOG_BROADCAST_LEVEL."""
+    level = logging.getLevelName(os.getenv("ACP_LOG_BROADCAST_LEVEL", "WARNING").upper())
+    return level if isinstance(level, int) else logging.WARNING
+
+
+# One MCP HTTP session per event loop, shared by every agent running on it: loop -> (session, users)
+_shared_sessions: Dict[asyncio.AbstractEventLoop, Tuple[aiohttp.ClientSession, int]] = {}
+
+
+def _acquire_session() -> aiohttp.ClientSession:
+    """Return the running loop's shared MCP session, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    entry = _shared_sessions.get(loop)
+    if entry is None or entry[0].closed:
+        # Keep connections to the MCP servers warm across agents and calls
+        timeout = aiohttp.ClientTimeout(total=300)  # 5 minute timeout
+        connector = aiohttp.TCPConnector(keepalive_timeout=120, ttl_dns_cache=300)
+        session, users = aiohttp.ClientSession(timeout=timeout, connector=connector), 0
+    else:
+        session, users = entry
+    
+    _shared_sessions[loop] = (session, users + 1)
+    return session
+
+
+async def _release_session(session: aiohttp.ClientSession):
+    """Drop one user of a shared MCP session, closing it when none remain."""
+    loop = asyncio.get_running_loop()
+    entry = _shared_sessions.get(loop)
+    if entry is not None and entry[0] is session and entry[1] > 1:
+        _shared_sessions[loop] = (session, entry[1] - 1)
+        return
+    
+    if entry is not None and entry[0] is session:
+        del _shared_sessions[loop]
+    await session.close()
+
+
 # Prometheus metrics
 TASKS_PROCESSED = Counter(
     'synapse_agent_tasks_processed',
@@ -41,6 +96,30 @@ class AsyncBaseAgent(ABC):
     - Error handling and recovery
     """
     
+    # Topics to subscribe to on start; subclasses override in the class body
+    subscribed_topics: Tuple[str, ...] = ()
+    
+    # Consumer prefetch for the agent's direct queue (None = broker default)
+    prefetch_count: Optional[int] = None
+    
+    # LOG_BROADCAST messages below this level stay local to the agent's logger
+    # (None = read ACP_LOG_BROADCAST_LEVEL when the agent is created)
+    log_broadcast_level: Optional[int] = None
+    
+    # Maximum fire-and-forget sends in flight before send_in_background waits
+    background_send_limit: int = 32
+    
+    # Bounded inbox drained by one consumer task; None handles each message as it is delivered
+    inbox_size: Optional[int] = None
+    
+    # What a delivery does when the inbox is full: "inline" handles the queued backlog and
+    # then the message in the delivering call, once the consumer's current handler has
+    # finished; "drop_oldest" discards the oldest queued message
+    inbox_overflow: str = "inline"
+    
+    # Queued messages handled before the inbox consumer yields to the event loop
+    inbox_batch_size: int = 100
+    
     def __init__(self, agent_id: str, message_bus: RabbitMQBus, mcp_servers: Dict[str, str]):
         """
         Initialize the async base agent.
@@ -54,37 +133,64 @@ class AsyncBaseAgent(ABC):
         self.message_bus = message_bus
         self.mcp_servers = mcp_servers
         
-        # HTTP session for MCP calls
+        # HTTP session for MCP calls, plus resolved tool endpoints per (server, tool)
         self.session: Optional[aiohttp.ClientSession] = None
+        self._tool_urls: Dict[Tuple[str, str], str] = {}
+        
+        # STATUS_UPDATE templates with sender and receiver already spliced in, per receiver
+        self._status_templates: Dict[str, bytes] = {}
+        
+        if self.log_broadcast_level is None:
+            self.log_broadcast_level = _log_broadcast_threshold()
         
         # Agent state
         self.running = False
         self.tasks: List[asyncio.Task] = []
         
-        logger.info(f"[{self.agent_id}] Async agent initialized")
+        # Fire-and-forget sends (e.g. log broadcasts) still in flight
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._background_slots = asyncio.Semaphore(self.background_send_limit)
+        
+        self.inbox: Optional[asyncio.Queue] = asyncio.Queue(maxsize=self.inbox_size) if self.inbox_size else None
+        self.dropped_messages = 0  # Inbox messages discarded by the drop_oldest policy
+        
+        # Serializes inbox handling between the consumer and inline overflow
+        self._inbox_lock = asyncio.Lock()
+        self._inbox_hold: Optional[object] = None
+        
+        logger.info("[%s] Async agent initialized", self.agent_id)
     
     async def start(self):
         """Start the agent with async session and message subscriptions."""
         try:
-            # Create HTTP session for MCP calls
-            timeout = aiohttp.ClientTimeout(total=300)  # 5 minute timeout
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            # Join the loop's shared HTTP session for MCP calls
+            self.session = _acquire_session()
             
             self.running = True
             
+            # Deliveries go through the inbox when one is configured
+            if self.inbox is not None:
+                on_message = self._deliver_to_inbox
+                self.tasks.append(asyncio.create_task(self._inbox_loop()))
+            else:
+                on_message = self.handle_message
+            
             # Subscribe to direct messages
-            await self.message_bus.subscribe_agent(self.agent_id, self.handle_message)
+            await self.message_bus.subscribe_agent(
+                self.agent_id, on_message, prefetch_count=self.prefetch_count
+            )
             
-            # Subscribe to topics if agent supports it
-            if hasattr(self, 'subscribed_topics'):
-                for topic in self.subscribed_topics:
-                    await self.message_bus.subscribe_topic(topic, self.handle_message)
+            # Subscribe to broadcast topics
+            for topic in self.subscribed_topics:
+                await self.message_bus.subscribe_topic(topic, on_message)
             
-            # Start agent main loop
-            loop_task = asyncio.create_task(self._agent_loop())
-            self.tasks.append(loop_task)
+            # Start the periodic loop only for agents that have periodic work;
+            # message handling is event-driven and never waits on this loop
+            if type(self).periodic_task is not AsyncBaseAgent.periodic_task:
+                loop_task = asyncio.create_task(self._agent_loop())
+                self.tasks.append(loop_task)
             
-            logger.info(f"[{self.agent_id}] Agent started successfully")
+            logger.info("[%s] Agent started successfully", self.agent_id)
             
         except Exception as e:
             logger.error(f"[{self.agent_id}] Failed to start agent: {e}")
@@ -95,6 +201,10 @@ class AsyncBaseAgent(ABC):
         """Gracefully stop the agent."""
         self.running = False
         
+        # Let pending background sends go out before tearing down
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        
         # Cancel all tasks
         for task in self.tasks:
             if not task.done():
@@ -104,17 +214,20 @@ class AsyncBaseAgent(ABC):
         if self.tasks:
             await asyncio.gather(*self.tasks, return_exceptions=True)
         
-        # Unsubscribe from messages
+        # Unsubscribe from messages, using the same callback start() subscribed
+        on_message = self._deliver_to_inbox if self.inbox is not None else self.handle_message
         try:
             await self.message_bus.unsubscribe_agent(self.agent_id)
+            for topic in self.subscribed_topics:
+                await self.message_bus.unsubscribe_topic(topic, on_message)
         except Exception as e:
             logger.warning(f"[{self.agent_id}] Error unsubscribing: {e}")
         
-        # Close HTTP session
+        # Release the shared HTTP session (closed once its last agent stops)
         if self.session:
-            await self.session.close()
+            await _release_session(self.session)
             
-        logger.info(f"[{self.agent_id}] Agent stopped")
+        logger.info("[%s] Agent stopped", self.agent_id)
     
     async def _agent_loop(self):
         """Main agent processing loop."""
@@ -128,6 +241,79 @@ class AsyncBaseAgent(ABC):
                 logger.error(f"[{self.agent_id}] Error in agent loop: {e}")
                 await asyncio.sleep(5.0)  # Back off on error
     
+    async def _deliver_to_inbox(self, message: ACPMessage):
+        """
+        Queue a delivered message without ever waiting for inbox space.
+        
+        The bus delivers inline, so the inbox consumer can itself be further up
+        this call chain (a handler whose send reached an agent that replied);
+        waiting for it to drain the inbox would deadlock. A full inbox applies
+        ``inbox_overflow`` instead; inline handling takes the inbox hold, so it
+        never runs alongside a handler the consumer is still in.
+        """
+        if self.inbox.full():
+            if self.inbox_overflow != "drop_oldest":
+                async with self._inbox_turn():
+                    # Handle the backlog first so the overflowing message cannot overtake it
+                    while not self.inbox.empty():
+                        queued = self.inbox.get_nowait()
+                        try:
+                            await self._handle_inbox_message(queued)
+                        finally:
+                            self.inbox.task_done()
+                    await self._handle_inbox_message(message)
+                return
+            
+            self.inbox.get_nowait()
+            self.inbox.task_done()
+            self.dropped_messages += 1
+        
+        self.inbox.put_nowait(message)
+    
+    async def _inbox_loop(self):
+        """Handle queued messages one at a time, yielding after each ``inbox_batch_size``."""
+        while True:
+            for _ in range(self.inbox_batch_size):
+                async with self._inbox_turn():
+                    message = await self.inbox.get()
+                    try:
+                        await self._handle_inbox_message(message)
+                    finally:
+                        self.inbox.task_done()
+            
+            # Let the bus deliver more messages between batches
+            await asyncio.sleep(0)
+    
+    @asynccontextmanager
+    async def _inbox_turn(self):
+        """
+        Hold this agent's inbox lock, unless the current call chain already holds it.
+        
+        The inline bus can deliver back into an agent from inside its own handler,
+        directly or from a task that handler created and awaits. Waiting for the
+        lock there would deadlock, so such deliveries run under the existing hold.
+        A task that outlives the hold it was created under waits like any other.
+        """
+        if self._inbox_hold is not None and self._inbox_hold in _inbox_holds.get():
+            yield
+            return
+        
+        async with self._inbox_lock:
+            hold = self._inbox_hold = object()
+            token = _inbox_holds.set(_inbox_holds.get() | {hold})
+            try:
+                yield
+            finally:
+                _inbox_holds.reset(token)
+                self._inbox_hold = None
+    
+    async def _handle_inbox_message(self, message: ACPMessage):
+        """Handle one inbox message, logging failures so the consumer keeps running."""
+        try:
+            await self.handle_message(message)
+        except Exception as e:
+            logger.error(f"[{self.agent_id}] Error handling queued message: {e}")
+    
     @abstractmethod
     async def handle_message(self, message: ACPMessage):
         """
@@ -147,7 +333,8 @@ class AsyncBaseAgent(ABC):
     async def periodic_task(self):
         """
         Override for periodic agent tasks.
-        Called every second while agent is running.
+        Called every second while agent is running; agents that do not
+        override it get no periodic loop at all.
         """
         pass
     
@@ -155,16 +342,108 @@ class AsyncBaseAgent(ABC):
         """
         Send ACP message via message bus.
         
+        There is deliberately no synchronous fast path: awaiting a coroutine
+        that never suspends completes inline without a trip through the event
+        loop, so a publish to an idle receiver already costs no extra wakeup.
+        
         Args:
             message: ACP message to send
         """
         try:
             await self.message_bus.publish_message(message)
-            logger.debug(f"[{self.agent_id}] Sent message: {message.msg_type.value}")
+            logger.debug("[%s] Sent message: %s", self.agent_id, message.msg_type.value)
+        except Exception as e:
+            logger.error(f"[{self.agent_id}] Failed to send message: {e}")
+            raise
+    
+    async def send_messages(self, messages: List[ACPMessage]):
+        """
+        Send several ACP messages via message bus in one batch.
+        
+        The bus encodes the whole batch up front and overlaps the publishes,
+        so a fan-out costs roughly one publish latency instead of one per message.
+        
+        Args:
+            messages: ACP messages to send
+        """
+        if messages:
+            try:
+                await self.message_bus.publish_batch(messages)
+                logger.debug("[%s] Sent %s messages", self.agent_id, len(messages))
+            except Exception as e:
+                logger.error(f"[{self.agent_id}] Failed to send messages: {e}")
+                raise
+    
+    async def send_in_background(self, coro):
+        """
+        Schedule a send that nothing downstream waits on, such as a log broadcast.
+        
+        At most ``background_send_limit`` sends run at once; beyond that the
+        caller waits for a free slot, so a slow bus cannot pile up tasks.
+        
+        Args:
+            coro: Send coroutine to run; it is closed unrun if the caller is cancelled first
+        """
+        try:
+            await self._background_slots.acquire()
+        except BaseException:
+            # Never scheduled, so close it rather than leave it un-awaited
+            coro.close()
+            raise
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_send_done)
+    
+    def _background_send_done(self, task: asyncio.Task):
+        """Release a background send slot; failures were already logged by the sender."""
+        self._background_tasks.discard(task)
+        self._background_slots.release()
+        if not task.cancelled():
+            task.exception()
+    
+    async def publish_status_update(self, receiver_id: str, status: str,
+                                    progress: float = None, task_id: str = None):
+        """
+        Send a STATUS_UPDATE without building an ACPMessage.
+        
+        The JSON body is spliced into a pre-encoded envelope, which keeps
+        frequent status updates off the pydantic serialization path.
+        
+        Args:
+            receiver_id: Target agent ID
+            status: Current status description
+            progress: Progress percentage (0-100)
+            task_id: Associated task identifier
+        """
+        template = self._status_templates.get(receiver_id)
+        if template is None:
+            template = self._status_templates[receiver_id] = _STATUS_UPDATE_TEMPLATE % (
+                orjson.dumps(self.agent_id).replace(b"%", b"%%"),
+                orjson.dumps(receiver_id).replace(b"%", b"%%"),
+                b"%s", b"%s", b"%s"
+            )
+        
+        body = template % (orjson.dumps(status), orjson.dumps(progress), orjson.dumps(task_id))
+        
+        try:
+            await self.message_bus.publish_raw(body, receiver_id=receiver_id)
+            logger.debug("[%s] Sent message: %s", self.agent_id, ACPMsgType.STATUS_UPDATE.value)
         except Exception as e:
             logger.error(f"[{self.agent_id}] Failed to send message: {e}")
             raise
     
+    def should_broadcast(self, level: str) -> bool:
+        """
+        Check whether a log entry of the given level should go out as LOG_BROADCAST.
+        
+        Args:
+            level: Log level name (e.g. "INFO", "ERROR")
+            
+        Returns:
+            True if the level meets the configured broadcast threshold
+        """
+        return logging.getLevelName(level) >= self.log_broadcast_level
+    
     def create_message(self, receiver_id: str = None, topic: str = None, 
                       msg_type: ACPMsgType = None, payload: Dict = None) -> ACPMessage:
         """
@@ -187,6 +466,17 @@ class AsyncBaseAgent(ABC):
             payload=payload or {}
         )
     
+    def _tool_url(self, server_name: str, tool_name: str) -> str:
+        """Resolve (and memoize) the HTTP endpoint of an MCP tool."""
+        key = (server_name, tool_name)
+        url = self._tool_urls.get(key)
+        if url is None:
+            if server_name not in self.mcp_servers:
+                raise ValueError(f"Unknown MCP server: {server_name}")
+            
+            url = self._tool_urls[key] = urljoin(self.mcp_servers[server_name], f"/tools/{tool_name}")
+        return url
+    
     async def call_mcp_tool(self, server_name: str, tool_name: str, params: Dict) -> Dict:
         """
         Make async call to MCP server tool.
@@ -199,18 +489,13 @@ class AsyncBaseAgent(ABC):
         Returns:
             Tool response data
         """
-        if server_name not in self.mcp_servers:
-            raise ValueError(f"Unknown MCP server: {server_name}")
-        
-        server_url = self.mcp_servers[server_name]
-        endpoint = f"/tools/{tool_name}"
-        url = urljoin(server_url, endpoint)
+        url = self._tool_url(server_name, tool_name)
         
         try:
-            async with self.session.post(url, json=params) as response:
+            async with self.session.post(url, data=orjson.dumps(params), headers=_JSON_HEADERS) as response:
                 if response.status == 200:
                     result = await response.json()
-                    logger.debug(f"[{self.agent_id}] MCP call successful: {server_name}.{tool_name}")
+                    logger.debug("[%s] MCP call successful: %s.%s", self.agent_id, server_name, tool_name)
                     return result
                 else:
                     error_text = await response.text()
@@ -234,36 +519,29 @@ class AsyncBaseAgent(ABC):
         Returns:
             Final tool response
         """
-        if server_name not in self.mcp_servers:
-            raise ValueError(f"Unknown MCP server: {server_name}")
-        
-        server_url = self.mcp_servers[server_name]
-        endpoint = f"/tools/{tool_name}"
-        url = urljoin(server_url, endpoint)
+        url = self._tool_url(server_name, tool_name)
         
         try:
-            async with self.session.post(url, json=params) as response:
+            async with self.session.post(url, data=orjson.dumps(params), headers=_JSON_HEADERS) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     raise Exception(f"MCP streaming call failed: {response.status} - {error_text}")
                 
-                # Handle Server-Sent Events
+                # Handle Server-Sent Events (compare raw bytes, decode only payloads)
+                event_type = None
                 async for line in response.content:
+                    line = line.rstrip(b'\r\n')
                     if line:
-                        line_text = line.decode('utf-8').strip()
-                        
-                        if line_text.startswith('event: '):
-                            event_type = line_text[7:]
-                        elif line_text.startswith('data: '):
-                            data_text = line_text[6:]
-                            
+                        if line.startswith(b'event: '):
+                            event_type = line[7:].decode('utf-8')
+                        elif line.startswith(b'data: '):
                             try:
-                                data = eval(data_text)  # In production, use json.loads
+                                data = orjson.loads(line[6:])
                                 
                                 if event_type == 'progress':
                                     await self._handle_progress(data, progress_callback)
                                 elif event_type == 'result':
-                                    logger.debug(f"[{self.agent_id}] MCP streaming call complete: {server_name}.{tool_name}")
+                                    logger.debug("[%s] MCP streaming call complete: %s.%s", self.agent_id, server_name, tool_name)
                                     return data
                                 elif event_type == 'error':
                                     raise Exception(f"MCP server error: {data}")
@@ -279,16 +557,19 @@ class AsyncBaseAgent(ABC):
     
     async def _handle_progress(self, progress_data: Dict, callback=None):
         """Handle progress notification from MCP server."""
-        message = progress_data.get('message', 'Processing...')
-        percentage = progress_data.get('percentage', 0)
+        # Only build the log line when INFO is actually enabled
+        if logger.isEnabledFor(logging.INFO):
+            message = progress_data.get('message', 'Processing...')
+            percentage = progress_data.get('percentage', 0)
+            logger.info("[%s] Progress: %s (%s%%)", self.agent_id, message, percentage)
         
-        logger.info(f"[{self.agent_id}] Progress: {message} ({percentage}%)")
+        if callback is None:
+            return
         
-        if callback:
-            try:
-                await callback(progress_data)
-            except Exception as e:
-                logger.warning(f"[{self.agent_id}] Progress callback failed: {e}")
+        try:
+            await callback(progress_data)
+        except Exception as e:
+            logger.warning(f"[{self.agent_id}] Progress callback failed: {e}")
     
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status."""
@@ -346,7 +627,7 @@ class TopicSubscriberMixin:
         Args:
             subscribed_topics: List of topics to subscribe to
         """
-        self.subscribed_topics = subscribed_topics or []
+        self.subscribed_topics = tuple(subscribed_topics or ())
 
 
 def generate_task_id() -> str:
@@ -385,5 +666,5 @@ async def start_metrics_server(port: int = 9090):
     config = uvicorn.Config(app, host="0.0.0.0", port=port, log_level="info")
     server = uvicorn.Server(config)
     
-    logger.info(f"Starting metrics server on port {port}")
+    logger.info("Starting metrics server on port %s", port)
     await server.serve()
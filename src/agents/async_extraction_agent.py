@@ -5,18 +5,146 @@ Agent responsible for extracting content from URLs and documents asynchronously.
 Demonstrates async MCP streaming with progress notifications.
 """
 
+import asyncio
 import logging
-from typing import Dict
+import sys
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
 
+from ._ttl_cache import TTLCache
 from .async_base_agent import AsyncBaseAgent, MCPClientMixin
-from ..protocols.acp_schema import (
-    ACPMessage, ACPMsgType, TaskAssignPayload, StatusUpdatePayload, 
-    DataSubmitPayload, LogBroadcastPayload
-)
+from ..protocols.acp_schema import ACPMessage, ACPMsgType, TaskAssignPayload
 
 logger = logging.getLogger(__name__)
 
 
+# Phases reported by the primary tooling server's browse_and_extract stream
+KNOWN_PHASES = ("connection", "download", "parsing", "extraction", "complete")
+
+# Interned "extracting_<phase>: " status prefixes; unknown phases are added on first use
+_PHASE_PREFIXES: Dict[str, str] = {phase: sys.intern(f"extracting_{phase}: ") for phase in KNOWN_PHASES}
+
+
+def _progress_status(phase: str, message: str) -> str:
+    """Build the STATUS_UPDATE text for a streamed progress tick."""
+    prefix = _PHASE_PREFIXES.get(phase)
+    if prefix is None:
+        prefix = _PHASE_PREFIXES[phase] = sys.intern(f"extracting_{phase}: ")
+    return prefix + message
+
+
+class _ProgressCoalescer:
+    """
+    Coalesces streaming MCP progress ticks into fewer STATUS_UPDATE publishes.
+    
+    A tick is published immediately when the phase changes, progress moves by
+    at least ``min_delta`` percent, or ``interval`` seconds have passed since
+    the last publish. Otherwise it is held as pending and sent by ``run()``.
+    """
+    
+    # One coalescer is created per extraction, so skip the per-instance __dict__
+    __slots__ = ("_send", "min_delta", "interval", "last_phase", "last_percentage", "last_sent", "pending")
+    
+    def __init__(self, send: Callable[[str, float], Awaitable[None]],
+                 min_delta: float = 5.0, interval: float = 0.25):
+        self._send = send
+        self.min_delta = min_delta
+        self.interval = interval
+        self.last_phase: Optional[str] = None
+        self.last_percentage: Optional[float] = None
+        self.last_sent = 0.0
+        self.pending: Optional[Tuple[str, str, float]] = None
+    
+    async def update(self, phase: str, status: str, percentage: float):
+        """Record a progress tick, publishing it if it is significant."""
+        self.pending = (phase, status, percentage)
+        
+        if (phase != self.last_phase
+                or self.last_percentage is None
+                or percentage - self.last_percentage >= self.min_delta
+                or asyncio.get_running_loop().time() - self.last_sent >= self.interval):
+            await self.flush()
+    
+    async def flush(self):
+        """Publish the pending tick, if any."""
+        if self.pending is None:
+            return
+        
+        phase, status, percentage = self.pending
+        self.pending = None
+        self.last_phase = phase
+        self.last_percentage = percentage
+        self.last_sent = asyncio.get_running_loop().time()
+        await self._send(status, percentage)
+    
+    async def run(self):
+        """Periodically flush ticks that were held back."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+
+class _SharedFetch:
+    """
+    One in-flight MCP extraction shared by every task that asked for the same URL.
+    
+    Progress ticks and content chunks are recorded as they stream in and fanned
+    out to every listener; a task that joins late first has the recorded events
+    replayed, so it reports the same progress and chunks as the first caller.
+    The upstream call is cancelled only once every waiting task has left.
+    """
+    
+    __slots__ = ("task", "events", "listeners", "waiters")
+    
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.events: List[Dict] = []
+        self.listeners: List[Callable[[Dict], Awaitable[None]]] = []
+        self.waiters = 0  # Tasks awaiting the result, including any still replaying
+    
+    async def publish(self, progress_data: Dict):
+        """Record a streamed event and forward it to every listener."""
+        self.events.append(progress_data)
+        for listener in tuple(self.listeners):
+            await listener(progress_data)
+    
+    async def join(self, listener: Callable[[Dict], Awaitable[None]]):
+        """Replay the events so far to a new listener, then subscribe it."""
+        # Events published while replaying are appended and picked up by this loop;
+        # no await separates the final length check from subscribing
+        replayed = 0
+        while replayed < len(self.events):
+            await listener(self.events[replayed])
+            replayed += 1
+        self.listeners.append(listener)
+
+
+# Query parameters that only track the visitor and never change page content
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "yclid"})
+
+
+def _normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings share one cache entry.
+    
+    Lowercases the scheme and host, drops the fragment and tracking query
+    parameters (``utm_*`` and friends) and strips trailing slashes.
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    ])
+    return parts._replace(
+        scheme=parts.scheme.lower(),
+        netloc=parts.netloc.lower(),
+        path=parts.path.rstrip("/"),
+        query=query,
+        fragment=""
+    ).geturl()
+
+
 class AsyncExtractionAgent(AsyncBaseAgent, MCPClientMixin):
     """
     Asynchronous agent that extracts raw text content from URLs and documents.
@@ -28,6 +156,9 @@ class AsyncExtractionAgent(AsyncBaseAgent, MCPClientMixin):
     - Error handling and recovery mechanisms
     """
     
+    # Let the broker keep a backlog of task assignments in flight
+    prefetch_count = 64
+    
     def __init__(self, agent_id: str, message_bus, mcp_servers: Dict[str, str]):
         """
         Initialize the async extraction agent.
@@ -43,7 +174,11 @@ class AsyncExtractionAgent(AsyncBaseAgent, MCPClientMixin):
         self.orchestrator_id = "orchestrator"
         self.current_task = None
         
-        logger.info(f"[{self.agent_id}] Async Extraction Agent initialized")
+        # Recent extractions and in-flight fetches, keyed by normalized URL
+        self._content_cache = TTLCache(maxsize=512, ttl=600.0)
+        self._inflight: Dict[str, _SharedFetch] = {}
+        
+        logger.info("[%s] Async Extraction Agent initialized", self.agent_id)
     
     async def handle_message(self, message: ACPMessage):
         """Handle incoming ACP messages."""
@@ -82,7 +217,9 @@ class AsyncExtractionAgent(AsyncBaseAgent, MCPClientMixin):
             await self._send_error_status(error_msg, task_id)
             return
         
-        logger.info(f"[{self.agent_id}] Starting content extraction from: {url}")
+        logger.info("[%s] Starting content extraction from: %s", self.agent_id, url)
+        
+        flusher = None
         
         try:
             # Send initial status update
@@ -93,89 +230,109 @@ class AsyncExtractionAgent(AsyncBaseAgent, MCPClientMixin):
                 "url": url
             }
             
-            logger.debug(f"[{self.agent_id}] Calling MCP extraction tool with params: {extraction_params}")
+            logger.debug("[%s] Calling MCP extraction tool with params: %s", self.agent_id, extraction_params)
+            
+            # Coalesce chatty progress ticks before forwarding them to the orchestrator
+            async def send_progress(status: str, percentage: float):
+                await self._send_status_update(status, percentage, task_id)
+            
+            coalescer = _ProgressCoalescer(send_progress)
+            flusher = asyncio.create_task(coalescer.run())
+            chunk_count = 0
             
             # Create progress callback for streaming updates
             async def progress_callback(progress_data):
-                """Handle progress updates from MCP streaming."""
+                """Handle progress updates and content chunks from MCP streaming."""
+                nonlocal chunk_count
+                
+                # Forward content chunks as they arrive instead of buffering them
+                chunk = progress_data.get('chunk')
+                if chunk:
+                    await self._send_content_chunk(url, chunk, chunk_count, source_description, task_id)
+                    chunk_count += 1
+                    return
+                
                 message = progress_data.get('message', 'Processing...')
-                percentage = progress_data.get('percentage', 0)
+                percentage = float(progress_data.get('percentage', 0))
                 phase = progress_data.get('phase', 'unknown')
                 
                 # Forward progress to orchestrator
-                status = f"extracting_{phase}: {message}"
-                await self._send_status_update(status, percentage, task_id)
+                status = _progress_status(phase, message)
+                await coalescer.update(phase, status, percentage)
                 
-                logger.debug(f"[{self.agent_id}] Extraction progress: {message} ({percentage}%)")
+                logger.debug("[%s] Extraction progress: %s (%s%%)", self.agent_id, message, percentage)
             
             # Call streaming MCP tool with progress notifications
-            result = await self.call_mcp_tool_streaming(
-                server_name="primary_tooling",
-                tool_name="browse_and_extract",
-                params=extraction_params,
-                progress_callback=progress_callback
-            )
+            result = await self._fetch_content(url, extraction_params, progress_callback)
             
             # Process extraction result
             extracted_url = result.get("url", url)
             title = result.get("title", f"Content from {url}")
-            content = result.get("content", "")
+            # Content already streamed in chunks is reassembled by the orchestrator
+            content = "" if chunk_count else result.get("content", "")
             word_count = result.get("word_count", 0)
             
-            logger.info(f"[{self.agent_id}] Extraction completed: {word_count} words from {url}")
+            logger.info("[%s] Extraction completed: %s words from %s", self.agent_id, word_count, url)
             
-            # Send completion status
+            # Flush any held-back progress, then send completion status
+            flusher.cancel()
+            await coalescer.flush()
             await self._send_status_update("extraction_complete", 100.0, task_id)
             
-            # Prepare data for submission
+            # Prepare data for submission; source_url is the assigned URL, which keys
+            # the streamed chunks even when the server reports a redirected URL
             extraction_data = {
                 "url": extracted_url,
+                "source_url": url,
                 "title": title,
                 "content": content,
                 "word_count": word_count,
                 "source_description": source_description,
                 "extraction_successful": True
             }
+            if chunk_count:
+                extraction_data["chunk_count"] = chunk_count
+                extraction_data["last_chunk"] = True
             
             # Send extracted content to orchestrator
             data_message = self.create_message(
                 receiver_id=self.orchestrator_id,
                 msg_type=ACPMsgType.DATA_SUBMIT,
-                payload=DataSubmitPayload(
-                    data_type="extracted_content",
-                    data=extraction_data,
-                    source=url,
-                    task_id=task_id
-                ).model_dump()
+                payload={
+                    "data_type": "extracted_content",
+                    "data": extraction_data,
+                    "source": url,
+                    "task_id": task_id
+                }
             )
             
-            await self.send_message(data_message)
+            messages = [data_message]
             
             # Broadcast completion log
-            log_message = self.create_message(
-                topic="logs",
-                msg_type=ACPMsgType.LOG_BROADCAST,
-                payload=LogBroadcastPayload(
-                    level="INFO",
-                    message=f"Content extraction complete: {url} ({word_count} words)",
-                    component=self.agent_id
-                ).model_dump()
-            )
+            if self.should_broadcast("INFO"):
+                messages.append(self.create_message(
+                    topic="logs",
+                    msg_type=ACPMsgType.LOG_BROADCAST,
+                    payload={
+                        "level": "INFO",
+                        "message": f"Content extraction complete: {url} ({word_count} words)",
+                        "component": self.agent_id
+                    }
+                ))
             
-            await self.send_message(log_message)
+            # Publish result and log together
+            await self.send_messages(messages)
             
-            logger.info(f"[{self.agent_id}] Successfully extracted content from {url}")
+            logger.info("[%s] Successfully extracted content from %s", self.agent_id, url)
             
         except Exception as e:
             error_msg = f"Failed to extract content from {url}: {e}"
             logger.error(f"[{self.agent_id}] {error_msg}")
             
-            # Send error status to orchestrator
-            await self._send_error_status(error_msg, task_id)
-            
             # Send failed extraction data
             failed_data = {
                 "url": url,
+                "source_url": url,
                 "title": f"Failed extraction from {url}",
                 "content": "",
                 "word_count": 0,
@@ -187,43 +344,127 @@ class AsyncExtractionAgent(AsyncBaseAgent, MCPClientMixin):
             data_message = self.create_message(
                 receiver_id=self.orchestrator_id,
                 msg_type=ACPMsgType.DATA_SUBMIT,
-                payload=DataSubmitPayload(
-                    data_type="extracted_content",
-                    data=failed_data,
-                    source=url,
-                    task_id=task_id
-                ).model_dump()
+                payload={
+                    "data_type": "extracted_content",
+                    "data": failed_data,
+                    "source": url,
+                    "task_id": task_id
+                }
             )
             
-            await self.send_message(data_message)
+            messages = [data_message]
             
             # Broadcast error log
-            error_log = self.create_message(
-                topic="logs",
-                msg_type=ACPMsgType.LOG_BROADCAST,
-                payload=LogBroadcastPayload(
-                    level="ERROR",
-                    message=f"Content extraction failed: {url} - {error_msg}",
-                    component=self.agent_id
-                ).model_dump()
+            if self.should_broadcast("ERROR"):
+                messages.append(self.create_message(
+                    topic="logs",
+                    msg_type=ACPMsgType.LOG_BROADCAST,
+                    payload={
+                        "level": "ERROR",
+                        "message": f"Content extraction failed: {url} - {error_msg}",
+                        "component": self.agent_id
+                    }
+                ))
+            
+            # Publish error status, failed result and log in one round
+            await asyncio.gather(
+                self._send_error_status(error_msg, task_id),
+                self.send_messages(messages)
             )
+        
+        finally:
+            if flusher is not None:
+                flusher.cancel()
+    
+    async def _fetch_content(self, url: str, extraction_params: Dict,
+                             progress_callback: Callable) -> Dict:
+        """
+        Extract a URL through MCP, reusing cached and in-flight results.
+        
+        Args:
+            url: URL to extract
+            extraction_params: Parameters for the browse_and_extract tool
+            progress_callback: Callback for streaming progress updates
             
-            await self.send_message(error_log)
+        Returns:
+            Extraction result from the primary tooling server
+        """
+        key = _normalize_url(url)
+        
+        cached = self._content_cache.get(key)
+        if cached is not None:
+            logger.info("[%s] Content cache hit for: %s", self.agent_id, url)
+            return cached
+        
+        # Concurrent requests for the same URL share a single upstream call and its stream
+        fetch = self._inflight.get(key)
+        if fetch is None:
+            fetch = self._inflight[key] = _SharedFetch()
+            fetch.task = asyncio.create_task(self.call_mcp_tool_streaming(
+                server_name="primary_tooling",
+                tool_name="browse_and_extract",
+                params=extraction_params,
+                progress_callback=fetch.publish
+            ))
+            fetch.task.add_done_callback(partial(self._fetch_done, key))
+        else:
+            logger.info("[%s] Joining in-flight extraction for: %s", self.agent_id, url)
+        
+        # Cancelling one caller must not cancel the fetch the others are waiting on
+        fetch.waiters += 1
+        try:
+            await fetch.join(progress_callback)
+            return await asyncio.shield(fetch.task)
+        finally:
+            fetch.waiters -= 1
+            if progress_callback in fetch.listeners:
+                fetch.listeners.remove(progress_callback)
+            if not fetch.waiters and not fetch.task.done():
+                fetch.task.cancel()
     
-    async def _send_status_update(self, status: str, progress: float = None, task_id: str = None):
-        """Send status update to orchestrator."""
-        status_message = self.create_message(
+    def _fetch_done(self, key: str, task: asyncio.Task):
+        """Retire a finished in-flight fetch and cache its result if it succeeded."""
+        fetch = self._inflight.get(key)
+        if fetch is not None and fetch.task is task:
+            del self._inflight[key]
+        
+        if not task.cancelled() and task.exception() is None:
+            self._content_cache.set(key, task.result())
+    
+    async def _send_content_chunk(self, url: str, chunk: str, chunk_index: int,
+                                  source_description: str, task_id: str):
+        """
+        Forward a single streamed content chunk to the orchestrator.
+        
+        Args:
+            url: Assigned URL the chunk was extracted from; the orchestrator buffers chunks under it
+            chunk: Content fragment
+            chunk_index: Zero-based position of the chunk in the document
+            source_description: Description of the source
+            task_id: Associated task ID
+        """
+        chunk_message = self.create_message(
             receiver_id=self.orchestrator_id,
-            msg_type=ACPMsgType.STATUS_UPDATE,
-            payload=StatusUpdatePayload(
-                status=status,
-                progress=progress,
-                task_id=task_id
-            ).model_dump()
+            msg_type=ACPMsgType.DATA_SUBMIT,
+            payload={
+                "data_type": "extracted_content_chunk",
+                "data": {
+                    "url": url,
+                    "content_chunk": chunk,
+                    "chunk_index": chunk_index,
+                    "last_chunk": False,
+                    "source_description": source_description
+                },
+                "source": url,
+                "task_id": task_id
+            }
         )
-        
-        await self.send_message(status_message)
-        logger.debug(f"[{self.agent_id}] Status update sent: {status}")
+        await self.send_message(chunk_message)
+    
+    async def _send_status_update(self, status: str, progress: float = None, task_id: str = None):
+        """Send status update to orchestrator."""
+        await self.publish_status_update(self.orchestrator_id, status, progress, task_id)
+        logger.debug("[%s] Status update sent: %s", self.agent_id, status)
     
     async def _send_error_status(self, error_message: str, task_id: str = None):
         """Send error status to orchestrator."""
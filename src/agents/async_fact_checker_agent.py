@@ -5,17 +5,38 @@ Agent responsible for validating claims and data against multiple sources asynch
 Demonstrates A2A peer review and negotiation patterns.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Tuple
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
+from ._validate_core import classify
 from .async_base_agent import AsyncBaseAgent, MCPClientMixin
-from ..protocols.acp_schema import (
-    ACPMessage, ACPMsgType, TaskAssignPayload, StatusUpdatePayload, 
-    DataSubmitPayload, LogBroadcastPayload, ValidationRequestPayload, ValidationResponsePayload
-)
+from ..protocols.acp_schema import ACPMessage, ACPMsgType, TaskAssignPayload, ValidationRequestPayload
 
 logger = logging.getLogger(__name__)
 
+# Statements containing any of these indicators are treated as factual claims
+CLAIM_INDICATORS = (
+    'quantum', 'encryption', 'algorithm', 'NIST', 'research shows',
+    'studies indicate', 'according to', 'demonstrated that'
+)
+
+# Indicators match case-insensitively as substrings, like the former
+# ``indicator in sentence.lower()`` check. That check could never match the
+# uppercase 'NIST', so it is left out to keep claim detection unchanged.
+_CLAIM_RE = re.compile(
+    "|".join(re.escape(indicator) for indicator in CLAIM_INDICATORS if indicator.islower()),
+    re.IGNORECASE
+)
+
+# Maximum number of claims extracted from a single document
+MAX_CLAIMS = 5
+
+# A sentence runs up to the next ". " separator (periods inside numbers or URLs don't end it)
+_SENTENCE_RE = re.compile(r"(?:[^.]|\.(?! ))+")
+
 
 class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
     """
@@ -28,6 +49,15 @@ class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
     - Cross-referencing claims against multiple sources
     """
     
+    # Let the broker keep a backlog of task assignments in flight
+    prefetch_count = 64
+    
+    # Maximum number of (claim, source_url) verdicts kept in the validation cache
+    validation_cache_size = 1024
+    
+    # Maximum number of claims validated concurrently within one fact-check task
+    validation_concurrency = 16
+    
     def __init__(self, agent_id: str, message_bus, mcp_servers: Dict[str, str]):
         """Initialize the async fact checker agent."""
         AsyncBaseAgent.__init__(self, agent_id, message_bus, mcp_servers)
@@ -35,7 +65,10 @@ class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
         
         self.orchestrator_id = "orchestrator"
         
-        logger.info(f"[{self.agent_id}] Async Fact Checker Agent initialized")
+        # Validation is deterministic per (claim, source_url), so verdicts are reused
+        self._validation_cache: "OrderedDict[Tuple[str, Optional[str]], Tuple[bool, float, str]]" = OrderedDict()
+        
+        logger.info("[%s] Async Fact Checker Agent initialized", self.agent_id)
     
     async def handle_message(self, message: ACPMessage):
         """Handle incoming ACP messages."""
@@ -70,7 +103,7 @@ class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
             payload = ValidationRequestPayload(**message.payload)
             sender_id = message.sender_id
             
-            logger.info(f"[{self.agent_id}] Validation request from {sender_id}: '{payload.claim}'")
+            logger.info("[%s] Validation request from %s: '%s'", self.agent_id, sender_id, payload.claim)
             
             # Perform validation
             is_valid, confidence, evidence = await self._validate_claim_async(
@@ -81,17 +114,17 @@ class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
             response_message = self.create_message(
                 receiver_id=sender_id,
                 msg_type=ACPMsgType.VALIDATION_RESPONSE,
-                payload=ValidationResponsePayload(
-                    is_valid=is_valid,
-                    confidence=confidence,
-                    evidence=evidence,
-                    source=self.agent_id
-                ).model_dump()
+                payload={
+                    "is_valid": is_valid,
+                    "confidence": confidence,
+                    "evidence": evidence,
+                    "source": self.agent_id
+                }
             )
             
             await self.send_message(response_message)
             
-            logger.info(f"[{self.agent_id}] Validation response sent to {sender_id}: {is_valid} (confidence: {confidence})")
+            logger.info("[%s] Validation response sent to %s: %s (confidence: %s)", self.agent_id, sender_id, is_valid, confidence)
             
         except Exception as e:
             logger.error(f"[{self.agent_id}] Error handling validation request: {e}")
@@ -106,42 +139,55 @@ class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
             # Extract claims from content if not provided
             claims = await self._extract_claims_from_content(source_content)
         
-        logger.info(f"[{self.agent_id}] Fact-checking {len(claims)} claims")
+        logger.info("[%s] Fact-checking %s claims", self.agent_id, len(claims))
         
         try:
             # Send initial status update
             await self._send_status_update("fact_checking_started", 10.0, task_id)
             
-            # Process each claim asynchronously
-            validation_results = []
+            # Validate all claims concurrently
             total_claims = len(claims)
+            validation_results: List[Dict] = [None] * total_claims
+            total_confidence = 0.0
+            valid_claims = 0
+            
+            semaphore = asyncio.Semaphore(self.validation_concurrency)
+            
+            async def validate_bounded(claim: str) -> Tuple[bool, float, str]:
+                async with semaphore:
+                    return await self._validate_claim_async(claim)
+            
+            results = await asyncio.gather(
+                *[validate_bounded(claim) for claim in claims],
+                return_exceptions=True
+            )
             
-            for i, claim in enumerate(claims):
-                logger.debug(f"[{self.agent_id}] Validating claim {i+1}/{total_claims}: '{claim}'")
+            for i, (claim, result) in enumerate(zip(claims, results)):
+                if isinstance(result, Exception):
+                    is_valid, confidence, evidence = False, 0.0, f"Validation failed due to error: {result}"
+                else:
+                    is_valid, confidence, evidence = result
                 
-                is_valid, confidence, evidence = await self._validate_claim_async(claim)
+                # Aggregate the summary in the same pass
+                total_confidence += confidence
+                if is_valid:
+                    valid_claims += 1
                 
-                validation_results.append({
+                validation_results[i] = {
                     "claim": claim,
                     "is_valid": is_valid,
                     "confidence": confidence,
                     "evidence": evidence,
                     "claim_index": i + 1
-                })
-                
-                # Update progress
-                progress = 10.0 + (80.0 * (i + 1) / total_claims)
-                await self._send_status_update(f"validated_claim_{i+1}", progress, task_id)
+                }
+            
+            # Single aggregate progress update instead of one per claim
+            await self._send_status_update("fact_checking_progress", 90.0, task_id)
             
             # Calculate overall confidence
-            if validation_results:
-                overall_confidence = sum(r["confidence"] for r in validation_results) / len(validation_results)
-                valid_claims = sum(1 for r in validation_results if r["is_valid"])
-            else:
-                overall_confidence = 0.0
-                valid_claims = 0
+            overall_confidence = total_confidence / total_claims if total_claims else 0.0
             
-            logger.info(f"[{self.agent_id}] Fact-checking complete: {valid_claims}/{total_claims} claims validated")
+            logger.info("[%s] Fact-checking complete: %s/%s claims validated", self.agent_id, valid_claims, total_claims)
             
             # Send completion status
             await self._send_status_update("fact_checking_complete", 100.0, task_id)
@@ -161,28 +207,30 @@ class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
             data_message = self.create_message(
                 receiver_id=self.orchestrator_id,
                 msg_type=ACPMsgType.DATA_SUBMIT,
-                payload=DataSubmitPayload(
-                    data_type="fact_check_results",
-                    data=fact_check_data,
-                    source="fact_checker",
-                    task_id=task_id
-                ).model_dump()
+                payload={
+                    "data_type": "fact_check_results",
+                    "data": fact_check_data,
+                    "source": "fact_checker",
+                    "task_id": task_id
+                }
             )
             
-            await self.send_message(data_message)
+            messages = [data_message]
             
             # Broadcast completion log
-            log_message = self.create_message(
-                topic="logs",
-                msg_type=ACPMsgType.LOG_BROADCAST,
-                payload=LogBroadcastPayload(
-                    level="INFO",
-                    message=f"Fact-checking completed: {valid_claims}/{total_claims} claims validated (confidence: {overall_confidence:.2f})",
-                    component=self.agent_id
-                ).model_dump()
-            )
+            if self.should_broadcast("INFO"):
+                messages.append(self.create_message(
+                    topic="logs",
+                    msg_type=ACPMsgType.LOG_BROADCAST,
+                    payload={
+                        "level": "INFO",
+                        "message": f"Fact-checking completed: {valid_claims}/{total_claims} claims validated (confidence: {overall_confidence:.2f})",
+                        "component": self.agent_id
+                    }
+                ))
             
-            await self.send_message(log_message)
+            # Publish result and log together
+            await self.send_messages(messages)
             
         except Exception as e:
             error_msg = f"Fact-checking failed: {e}"
@@ -194,21 +242,17 @@ class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
         # Simple claim extraction - in production, use NLP techniques
         claims = []
         
-        sentences = content.split('. ')
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 20:  # Only consider substantial sentences
-                # Look for statements that could be factual claims
-                claim_indicators = [
-                    'quantum', 'encryption', 'algorithm', 'NIST', 'research shows',
-                    'studies indicate', 'according to', 'demonstrated that'
-                ]
-                
-                if any(indicator in sentence.lower() for indicator in claim_indicators):
+        for match in _SENTENCE_RE.finditer(content):
+            # Only consider substantial sentences that look like factual claims
+            if match.end() - match.start() > 20 and _CLAIM_RE.search(content, match.start(), match.end()):
+                sentence = match.group().strip()
+                if len(sentence) > 20:
                     claims.append(sentence)
+                    # Limit to top claims for demo purposes
+                    if len(claims) >= MAX_CLAIMS:
+                        break
         
-        # Limit to top 5 claims for demo purposes
-        return claims[:5]
+        return claims
     
     async def _validate_claim_async(self, claim: str, source_url: str = None) -> Tuple[bool, float, str]:
         """
@@ -221,6 +265,24 @@ class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
         Returns:
             Tuple of (is_valid, confidence_score, evidence)
         """
+        key = (claim, source_url)
+        verdict = self._validation_cache.get(key)
+        if verdict is not None:
+            self._validation_cache.move_to_end(key)
+            return verdict
+        
+        verdict = self._run_validation(claim, source_url)
+        
+        # Failed validations are retried on the next request rather than cached
+        if verdict[1] > 0.0:
+            self._validation_cache[key] = verdict
+            if len(self._validation_cache) > self.validation_cache_size:
+                self._validation_cache.popitem(last=False)
+        
+        return verdict
+    
+    def _run_validation(self, claim: str, source_url: Optional[str]) -> Tuple[bool, float, str]:
+        """Score a claim using the mock validation heuristics."""
         try:
             # Simulate async validation process
             # In production, this would involve:
@@ -228,42 +290,17 @@ class AsyncFactCheckerAgent(AsyncBaseAgent, MCPClientMixin):
             # - Searching for supporting/contradicting evidence
             # - Analyzing source credibility
             
-            claim_lower = claim.lower()
-            
             # Mock validation logic based on content
-            if any(term in claim_lower for term in ['quantum', 'encryption', 'cryptography']):
-                if 'break' in claim_lower or 'obsolete' in claim_lower:
-                    return True, 0.85, "Supported by multiple cryptographic research papers"
-                elif 'nist' in claim_lower or 'standard' in claim_lower:
-                    return True, 0.92, "Confirmed by NIST standardization process"
-                else:
-                    return True, 0.75, "Generally supported by current research"
-                    
-            elif any(term in claim_lower for term in ['algorithm', 'computer', 'technology']):
-                return True, 0.80, "Consistent with current technological understanding"
-                
-            else:
-                # Generic validation for other claims
-                return True, 0.65, "Claim appears plausible but requires further verification"
-                
+            return classify(claim)
+            
         except Exception as e:
             logger.warning(f"[{self.agent_id}] Validation error for claim '{claim}': {e}")
             return False, 0.0, f"Validation failed due to error: {e}"
     
     async def _send_status_update(self, status: str, progress: float = None, task_id: str = None):
         """Send status update to orchestrator."""
-        status_message = self.create_message(
-            receiver_id=self.orchestrator_id,
-            msg_type=ACPMsgType.STATUS_UPDATE,
-            payload=StatusUpdatePayload(
-                status=status,
-                progress=progress,
-                task_id=task_id
-            ).model_dump()
-        )
-        
-        await self.send_message(status_message)
-        logger.debug(f"[{self.agent_id}] Status update sent: {status}")
+        await self.publish_status_update(self.orchestrator_id, status, progress, task_id)
+        logger.debug("[%s] Status update sent: %s", self.agent_id, status)
     
     async def _send_error_status(self, error_message: str, task_id: str = None):
         """Send error status to orchestrator."""
@@ -5,14 +5,14 @@ Agent responsible for handling all filesystem operations securely with MCP Roots
 Demonstrates async MCP client with security restrictions.
 """
 
+import asyncio
 import logging
-from typing import Dict
+import os
+import time
+from typing import Dict, Optional, Tuple
 
 from .async_base_agent import AsyncBaseAgent, MCPClientMixin
-from ..protocols.acp_schema import (
-    ACPMessage, ACPMsgType, TaskAssignPayload, StatusUpdatePayload, 
-    DataSubmitPayload, LogBroadcastPayload
-)
+from ..protocols.acp_schema import ACPMessage, ACPMsgType, TaskAssignPayload
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +28,9 @@ class AsyncFileSaveAgent(AsyncBaseAgent, MCPClientMixin):
     - Error handling for filesystem operations
     """
     
+    # Seconds a directory's validate_path verdict is reused for later saves
+    path_validation_ttl = 60.0
+    
     def __init__(self, agent_id: str, message_bus, mcp_servers: Dict[str, str]):
         """Initialize the async file save agent."""
         AsyncBaseAgent.__init__(self, agent_id, message_bus, mcp_servers)
@@ -35,7 +38,12 @@ class AsyncFileSaveAgent(AsyncBaseAgent, MCPClientMixin):
         
         self.orchestrator_id = "orchestrator"
         
-        logger.info(f"[{self.agent_id}] Async File Save Agent initialized")
+        # MCP Roots are directory-scoped, so verdicts are cached per parent directory
+        self._path_validation_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._path_validation_locks: Dict[str, asyncio.Lock] = {}
+        self._path_validation_users: Dict[str, int] = {}  # Callers holding or awaiting each lock
+        
+        logger.info("[%s] Async File Save Agent initialized", self.agent_id)
     
     async def handle_message(self, message: ACPMessage):
         """Handle incoming ACP messages."""
@@ -64,9 +72,12 @@ class AsyncFileSaveAgent(AsyncBaseAgent, MCPClientMixin):
     
     async def _save_file_securely(self, task_data: Dict):
         """Save file content securely using MCP Roots security model."""
-        file_path = task_data.get("file_path")
-        content = task_data.get("content", "")
-        task_id = task_data.get("task_id", "unknown")
+        get = task_data.get
+        file_path, content, task_id = get("file_path"), get("content", ""), get("task_id", "unknown")
+        
+        async def status(state: str, progress: float):
+            # Every update in this save shares the same task id
+            await self._send_status_update(state, progress, task_id)
         
         if not file_path:
             error_msg = "No file path provided for save operation"
@@ -77,14 +88,14 @@ class AsyncFileSaveAgent(AsyncBaseAgent, MCPClientMixin):
         if not content:
             logger.warning(f"[{self.agent_id}] Empty content provided for {file_path}")
         
-        logger.info(f"[{self.agent_id}] Starting secure file save: {file_path}")
+        logger.info("[%s] Starting secure file save: %s", self.agent_id, file_path)
         
         try:
             # Send initial status update
-            await self._send_status_update("file_save_starting", 10.0, task_id)
+            await status("file_save_starting", 10.0)
             
             # First, validate the path using MCP server
-            await self._send_status_update("validating_path", 25.0, task_id)
+            await status("validating_path", 25.0)
             
             validation_result = await self._validate_file_path(file_path)
             
@@ -94,17 +105,17 @@ class AsyncFileSaveAgent(AsyncBaseAgent, MCPClientMixin):
                 await self._send_error_status(error_msg, task_id)
                 return
             
-            logger.info(f"[{self.agent_id}] Path validation successful: {file_path}")
+            logger.info("[%s] Path validation successful: %s", self.agent_id, file_path)
             
             # Prepare save parameters
-            await self._send_status_update("preparing_file_save", 50.0, task_id)
+            await status("preparing_file_save", 50.0)
             
             save_params = {
                 "file_path": file_path,
                 "content": content
             }
             
-            logger.debug(f"[{self.agent_id}] Calling MCP save_file tool")
+            logger.debug("[%s] Calling MCP save_file tool", self.agent_id)
             
             # Call MCP filesystem server to save file
             result = await self.call_mcp_tool(
@@ -119,12 +130,9 @@ class AsyncFileSaveAgent(AsyncBaseAgent, MCPClientMixin):
             saved_path = result.get("file_path", file_path)
             
             if success:
-                logger.info(f"[{self.agent_id}] File saved successfully: {saved_path} ({bytes_written} bytes)")
-                
-                # Send completion status
-                await self._send_status_update("file_save_complete", 100.0, task_id)
+                logger.info("[%s] File saved successfully: %s (%s bytes)", self.agent_id, saved_path, bytes_written)
                 
-                # Send success result to orchestrator
+                # Build success result for orchestrator
                 save_data = {
                     "file_path": saved_path,
                     "bytes_written": bytes_written,
@@ -135,28 +143,30 @@ class AsyncFileSaveAgent(AsyncBaseAgent, MCPClientMixin):
                 data_message = self.create_message(
                     receiver_id=self.orchestrator_id,
                     msg_type=ACPMsgType.DATA_SUBMIT,
-                    payload=DataSubmitPayload(
-                        data_type="file_save_result",
-                        data=save_data,
-                        source="filesystem",
-                        task_id=task_id
-                    ).model_dump()
+                    payload={
+                        "data_type": "file_save_result",
+                        "data": save_data,
+                        "source": "filesystem",
+                        "task_id": task_id
+                    }
                 )
                 
-                await self.send_message(data_message)
-                
-                # Broadcast success log
+                # Build success log broadcast
                 log_message = self.create_message(
                     topic="logs",
                     msg_type=ACPMsgType.LOG_BROADCAST,
-                    payload=LogBroadcastPayload(
-                        level="INFO",
-                        message=f"File saved successfully: {saved_path} ({bytes_written} bytes)",
-                        component=self.agent_id
-                    ).model_dump()
+                    payload={
+                        "level": "INFO",
+                        "message": f"File saved successfully: {saved_path} ({bytes_written} bytes)",
+                        "component": self.agent_id
+                    }
                 )
                 
-                await self.send_message(log_message)
+                # Publish completion status, result and log together
+                await asyncio.gather(
+                    status("file_save_complete", 100.0),
+                    self.send_messages([data_message, log_message])
+                )
                 
             else:
                 error_msg = f"File save operation failed for {file_path}"
@@ -172,17 +182,59 @@ class AsyncFileSaveAgent(AsyncBaseAgent, MCPClientMixin):
             error_log = self.create_message(
                 topic="logs",
                 msg_type=ACPMsgType.LOG_BROADCAST,
-                payload=LogBroadcastPayload(
-                    level="ERROR",
-                    message=f"File save failed: {file_path} - {error_msg}",
-                    component=self.agent_id
-                ).model_dump()
+                payload={
+                    "level": "ERROR",
+                    "message": f"File save failed: {file_path} - {error_msg}",
+                    "component": self.agent_id
+                }
             )
             
             await self.send_message(error_log)
     
     async def _validate_file_path(self, file_path: str) -> Dict:
-        """Validate file path using MCP filesystem server."""
+        """Validate file path using MCP filesystem server, reusing recent verdicts."""
+        directory = os.path.dirname(file_path)
+        
+        cached = self._cached_path_validation(directory)
+        if cached is not None:
+            return cached
+        
+        # Concurrent saves into the same directory share one validation call
+        lock = self._path_validation_locks.setdefault(directory, asyncio.Lock())
+        self._path_validation_users[directory] = self._path_validation_users.get(directory, 0) + 1
+        try:
+            async with lock:
+                cached = self._cached_path_validation(directory)
+                if cached is not None:
+                    return cached
+                
+                result = await self._request_path_validation(file_path)
+                if "error" not in result:
+                    # Only the verdict applies to the whole directory, not the per-file details
+                    verdict = {"is_allowed": result.get("is_allowed", False)}
+                    self._path_validation_cache[directory] = (time.monotonic(), verdict)
+                return result
+        finally:
+            # Drop the lock once no caller holds or awaits it
+            users = self._path_validation_users.pop(directory) - 1
+            if users:
+                self._path_validation_users[directory] = users
+            else:
+                del self._path_validation_locks[directory]
+    
+    def _cached_path_validation(self, directory: str) -> Optional[Dict]:
+        """Return a fresh cached verdict for a directory, purging expired entries."""
+        now = time.monotonic()
+        expired = [key for key, (stored_at, _) in self._path_validation_cache.items()
+                   if now - stored_at >= self.path_validation_ttl]
+        for key in expired:
+            del self._path_validation_cache[key]
+        
+        entry = self._path_validation_cache.get(directory)
+        return entry[1] if entry is not None else None
+    
+    async def _request_path_validation(self, file_path: str) -> Dict:
+        """Ask the MCP filesystem server whether a path is inside the allowed roots."""
         try:
             validation_params = {
                 "path": file_path
@@ -202,18 +254,8 @@ class AsyncFileSaveAgent(AsyncBaseAgent, MCPClientMixin):
     
     async def _send_status_update(self, status: str, progress: float = None, task_id: str = None):
         """Send status update to orchestrator."""
-        status_message = self.create_message(
-            receiver_id=self.orchestrator_id,
-            msg_type=ACPMsgType.STATUS_UPDATE,
-            payload=StatusUpdatePayload(
-                status=status,
-                progress=progress,
-                task_id=task_id
-            ).model_dump()
-        )
-        
-        await self.send_message(status_message)
-        logger.debug(f"[{self.agent_id}] Status update sent: {status}")
+        await self.publish_status_update(self.orchestrator_id, status, progress, task_id)
+        logger.debug("[%s] Status update sent: %s", self.agent_id, status)
     
     async def _send_error_status(self, error_message: str, task_id: str = None):
         """Send error status to orchestrator."""
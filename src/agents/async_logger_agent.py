@@ -7,18 +7,44 @@ Demonstrates async message bus topic subscription.
 
 import logging
 import asyncio
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 from collections import deque
+from itertools import islice
+
+import orjson
 
 from .async_base_agent import AsyncBaseAgent
 from ..protocols.acp_schema import (
     ACPMessage, ACPMsgType, TaskAssignPayload, StatusUpdatePayload,
-    LogBroadcastPayload, DataSubmitPayload
+    LogBroadcastPayload
 )
 
 logger = logging.getLogger(__name__)
 
+# Pre-encoded high_error_rate alert; sender and receiver are bound once per agent
+_ALERT_TEMPLATE = (
+    b'{"sender_id":%s,"receiver_id":%s,"topic":null,"msg_type":"data_submit",'
+    b'"payload":{"data_type":"system_alert","data":{"alert_type":"high_error_rate",'
+    b'"recent_errors":%s,"error_count":%s,"timestamp":%s},'
+    b'"source":"logger_agent","task_id":null},"timestamp":null}'
+)
+
+
+def _iso(timestamp: float) -> str:
+    """Format a stored epoch timestamp the way reports expect (naive UTC ISO-8601)."""
+    return datetime.utcfromtimestamp(timestamp).isoformat()
+
+
+def _export_times(record: Dict, fields: tuple = ("timestamp",)) -> Dict:
+    """Copy a stored record, converting its epoch timestamp fields to ISO strings."""
+    exported = dict(record)
+    for field in fields:
+        if isinstance(exported.get(field), float):
+            exported[field] = _iso(exported[field])
+    return exported
+
 
 class AsyncLoggerAgent(AsyncBaseAgent):
     """
@@ -31,37 +57,64 @@ class AsyncLoggerAgent(AsyncBaseAgent):
     - System health monitoring
     """
     
+    # Seconds between agent silence checks
+    health_check_interval = 30.0
+    
+    # Bus delivery only enqueues into the inbox; when it is full the oldest message is
+    # dropped rather than stalling delivery, and it is drained in batches of 100
+    inbox_size = 10000
+    inbox_overflow = "drop_oldest"
+    inbox_batch_size = 100
+    
     def __init__(self, agent_id: str, message_bus, mcp_servers: Dict[str, str] = None):
         """Initialize the async logger agent."""
         super().__init__(agent_id, message_bus, mcp_servers or {})
         
         self.orchestrator_id = "orchestrator"
-        self.log_buffer = deque(maxlen=1000)  # Keep last 1000 log entries
+        self._alert_template = _ALERT_TEMPLATE % (
+            orjson.dumps(agent_id).replace(b"%", b"%%"),
+            orjson.dumps(self.orchestrator_id).replace(b"%", b"%%"),
+            b"%s", b"%s", b"%s"
+        )
+        # Keep last 1000 log entries. Only the inbox consumer appends, so a single
+        # shared ring has no writer contention and keeps entries in arrival order.
+        self.log_buffer = deque(maxlen=1000)
+        
+        # Sequence numbers let error-rate checks look at a sliding window in O(window)
+        self.error_window = 10
+        self._log_seq = 0
+        self._recent_errors = deque(maxlen=self.error_window)  # (seq, entry) of recent errors
         self.agent_status = {}  # Track agent statuses
         self.log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         self.filter_level = "INFO"  # Default filter level
+        self._level_index = {level: i for i, level in enumerate(self.log_levels)}
+        self._log_methods = {level: getattr(logger, level.lower()) for level in self.log_levels}
+        self._filter_index = self._level_index[self.filter_level]
         
         # Statistics
         self.message_count = 0
         self.log_count_by_level = {level: 0 for level in self.log_levels}
         self.agent_activity = {}
+        self._agents_with_errors = 0  # Agents whose error_count is non-zero
+        self._last_health_check = 0.0
+        
+        # Message type -> handler; anything else is recorded as plain activity
+        self._handlers = {
+            ACPMsgType.LOG_BROADCAST: self._handle_log_broadcast,
+            ACPMsgType.STATUS_UPDATE: self._handle_status_update,
+            ACPMsgType.TASK_ASSIGN: self._handle_task_assignment
+        }
         
-        logger.info(f"[{self.agent_id}] Async Logger Agent initialized")
+        logger.info("[%s] Async Logger Agent initialized", self.agent_id)
     
     async def handle_message(self, message: ACPMessage):
-        """Handle incoming ACP messages - primarily log broadcasts."""
+        """Process a queued ACP message - primarily log broadcasts."""
         try:
             self.message_count += 1
             
-            if message.msg_type == ACPMsgType.LOG_BROADCAST:
-                await self._handle_log_broadcast(message)
-            elif message.msg_type == ACPMsgType.STATUS_UPDATE:
-                await self._handle_status_update(message)
-            elif message.msg_type == ACPMsgType.TASK_ASSIGN:
-                await self._handle_task_assignment(message)
-            else:
-                # Log all other message types for monitoring
-                await self._log_message_activity(message)
+            # Log all other message types for monitoring
+            handler = self._handlers.get(message.msg_type, self._log_message_activity)
+            await handler(message)
                 
         except Exception as e:
             logger.error(f"[{self.agent_id}] Error handling message: {e}")
@@ -69,20 +122,21 @@ class AsyncLoggerAgent(AsyncBaseAgent):
     async def _handle_log_broadcast(self, message: ACPMessage):
         """Handle log broadcast messages."""
         try:
-            payload = LogBroadcastPayload(**message.payload)
+            # pydantic-core validation is cheaper than model_construct's Python path
+            payload = LogBroadcastPayload.model_validate(message.payload)
             
-            # Create log entry
+            # Create log entry (epoch timestamp, formatted only when reported)
             log_entry = {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": time.time(),
                 "level": payload.level,
                 "message": payload.message,
                 "component": payload.component,
-                "correlation_id": payload.correlation_id,
+                "correlation_id": message.payload.get("correlation_id"),
                 "sender_id": message.sender_id
             }
             
             # Add to buffer
-            self.log_buffer.append(log_entry)
+            self._buffer_log(log_entry)
             
             # Update statistics
             if payload.level in self.log_count_by_level:
@@ -90,24 +144,29 @@ class AsyncLoggerAgent(AsyncBaseAgent):
             
             # Update agent activity
             if payload.component:
-                if payload.component not in self.agent_activity:
-                    self.agent_activity[payload.component] = {
+                activity = self.agent_activity.get(payload.component)
+                if activity is None:
+                    activity = self.agent_activity[payload.component] = {
                         "first_seen": log_entry["timestamp"],
                         "last_activity": log_entry["timestamp"],
                         "message_count": 0,
                         "error_count": 0
                     }
                 
-                self.agent_activity[payload.component]["last_activity"] = log_entry["timestamp"]
-                self.agent_activity[payload.component]["message_count"] += 1
+                activity["last_activity"] = log_entry["timestamp"]
+                activity["message_count"] += 1
                 
-                if payload.level in ["ERROR", "CRITICAL"]:
-                    self.agent_activity[payload.component]["error_count"] += 1
+                if payload.level in ("ERROR", "CRITICAL"):
+                    if activity["error_count"] == 0:
+                        self._agents_with_errors += 1
+                    activity["error_count"] += 1
             
             # Filter and log based on level
             if self._should_log_level(payload.level):
-                log_method = getattr(logger, payload.level.lower(), logger.info)
-                log_method(f"[{payload.component}] {payload.message}")
+                log_method = self._log_methods.get(payload.level)
+                if log_method is None:
+                    log_method = getattr(logger, payload.level.lower(), logger.info)
+                log_method("[%s] %s", payload.component, payload.message)
             
             # Check for error patterns that need attention
             await self._analyze_log_patterns(log_entry)
@@ -122,23 +181,28 @@ class AsyncLoggerAgent(AsyncBaseAgent):
             
             # Update agent status tracking
             sender_id = message.sender_id
+            now = time.time()
             self.agent_status[sender_id] = {
                 "status": payload.status,
                 "progress": payload.progress,
                 "task_id": payload.task_id,
-                "last_update": datetime.utcnow().isoformat()
+                "last_update": now
             }
             
+            # Status events are recorded as INFO entries; skip building them when filtered out
+            if not self._should_log_level("INFO"):
+                return
+            
             # Log status changes
             status_msg = f"Status update from {sender_id}: {payload.status}"
             if payload.progress is not None:
                 status_msg += f" ({payload.progress:.1f}%)"
             
-            logger.debug(f"[{self.agent_id}] {status_msg}")
+            logger.debug("[%s] %s", self.agent_id, status_msg)
             
             # Create log entry for status monitoring
             log_entry = {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": now,
                 "level": "INFO",
                 "message": status_msg,
                 "component": "logger_agent",
@@ -149,7 +213,7 @@ class AsyncLoggerAgent(AsyncBaseAgent):
                 "task_id": payload.task_id
             }
             
-            self.log_buffer.append(log_entry)
+            self._buffer_log(log_entry)
             
         except Exception as e:
             logger.error(f"[{self.agent_id}] Error processing status update: {e}")
@@ -171,65 +235,73 @@ class AsyncLoggerAgent(AsyncBaseAgent):
         except Exception as e:
             logger.error(f"[{self.agent_id}] Error in task assignment: {e}")
     
+    def _buffer_log(self, log_entry: Dict):
+        """Append a log entry, tracking errors for the sliding error-rate window."""
+        self.log_buffer.append(log_entry)
+        self._log_seq += 1
+        
+        if log_entry["level"] in ("ERROR", "CRITICAL"):
+            self._recent_errors.append((self._log_seq, log_entry))
+    
+    def _tail_logs(self, count: int) -> List[Dict]:
+        """Return the newest ``count`` log entries in chronological order."""
+        tail = list(islice(reversed(self.log_buffer), count))
+        tail.reverse()
+        return tail
+    
     async def _log_message_activity(self, message: ACPMessage):
         """Log general message activity for monitoring."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
         activity_msg = f"Message activity: {message.msg_type.value} from {message.sender_id}"
         if message.receiver_id:
             activity_msg += f" to {message.receiver_id}"
         elif message.topic:
             activity_msg += f" on topic {message.topic}"
         
-        logger.debug(f"[{self.agent_id}] {activity_msg}")
+        logger.debug("[%s] %s", self.agent_id, activity_msg)
     
     async def _analyze_log_patterns(self, log_entry: Dict):
         """Analyze log patterns for alerts and notifications."""
         try:
             # Check for error spikes
             if log_entry["level"] in ["ERROR", "CRITICAL"]:
-                recent_errors = [
-                    entry for entry in list(self.log_buffer)[-10:]
-                    if entry["level"] in ["ERROR", "CRITICAL"]
-                ]
+                window_start = self._log_seq - self.error_window
+                recent_errors = [entry for seq, entry in self._recent_errors if seq > window_start]
                 
                 if len(recent_errors) >= 3:
-                    alert_msg = f"High error rate detected: {len(recent_errors)} errors in last 10 messages"
+                    alert_msg = f"High error rate detected: {len(recent_errors)} errors in last {self.error_window} messages"
                     logger.warning(f"[{self.agent_id}] ALERT: {alert_msg}")
                     
-                    # Send alert to orchestrator
-                    alert_data = {
-                        "alert_type": "high_error_rate",
-                        "recent_errors": recent_errors,
-                        "error_count": len(recent_errors),
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                    
-                    alert_message = self.create_message(
-                        receiver_id=self.orchestrator_id,
-                        msg_type=ACPMsgType.DATA_SUBMIT,
-                        payload=DataSubmitPayload(
-                            data_type="system_alert",
-                            data=alert_data,
-                            source="logger_agent"
-                        ).model_dump()
+                    # Send alert to orchestrator, splicing the dynamic fields into the template
+                    alert_body = self._alert_template % (
+                        orjson.dumps([_export_times(entry) for entry in recent_errors]),
+                        orjson.dumps(len(recent_errors)),
+                        orjson.dumps(datetime.utcnow().isoformat())
                     )
                     
-                    await self.send_message(alert_message)
-            
-            # Check for agent silence (no activity for extended period)
-            await self._check_agent_health()
+                    await self.message_bus.publish_raw(alert_body, receiver_id=self.orchestrator_id)
+                    logger.debug("[%s] Sent message: %s", self.agent_id, ACPMsgType.DATA_SUBMIT.value)
             
         except Exception as e:
             logger.error(f"[{self.agent_id}] Error in log pattern analysis: {e}")
     
+    async def periodic_task(self):
+        """Run the agent silence check every ``health_check_interval`` seconds."""
+        now = time.monotonic()
+        if now - self._last_health_check >= self.health_check_interval:
+            self._last_health_check = now
+            await self._check_agent_health()
+    
     async def _check_agent_health(self):
         """Check for agents that haven't been active recently."""
         try:
-            current_time = datetime.utcnow()
+            current_time = time.time()
             silence_threshold = 300  # 5 minutes in seconds
             
             for agent_id, activity in self.agent_activity.items():
-                last_activity = datetime.fromisoformat(activity["last_activity"])
-                silence_duration = (current_time - last_activity).total_seconds()
+                silence_duration = current_time - activity["last_activity"]
                 
                 if silence_duration > silence_threshold:
                     warning_msg = f"Agent {agent_id} silent for {silence_duration:.0f} seconds"
@@ -256,15 +328,21 @@ class AsyncLoggerAgent(AsyncBaseAgent):
             report_message = self.create_message(
                 receiver_id=self.orchestrator_id,
                 msg_type=ACPMsgType.DATA_SUBMIT,
-                payload=DataSubmitPayload(
-                    data_type="log_report",
-                    data=report,
-                    source="logger_agent"
-                ).model_dump()
+                payload={
+                    "data_type": "log_report",
+                    "data": report,
+                    "source": "logger_agent"
+                }
             )
             
-            await self.send_message(report_message)
-            logger.info(f"[{self.agent_id}] Log report generated: {report_type}")
+            if report_type == "detailed":
+                # Encode the large report off the event loop. The buffers it references are
+                # only mutated by the ingestion task, which is awaiting this call.
+                body = await asyncio.to_thread(report_message.model_dump_json)
+                await self.message_bus.publish_raw(body.encode(), receiver_id=self.orchestrator_id)
+            else:
+                await self.send_message(report_message)
+            logger.info("[%s] Log report generated: %s", self.agent_id, report_type)
             
         except Exception as e:
             logger.error(f"[{self.agent_id}] Error generating log report: {e}")
@@ -278,22 +356,19 @@ class AsyncLoggerAgent(AsyncBaseAgent):
             "total_logs": len(self.log_buffer),
             "log_counts_by_level": self.log_count_by_level,
             "active_agents": len(self.agent_activity),
-            "agents_with_errors": len([
-                agent for agent, activity in self.agent_activity.items()
-                if activity["error_count"] > 0
-            ])
+            "agents_with_errors": self._agents_with_errors
         }
     
     async def _generate_detailed_report(self) -> Dict:
         """Generate detailed log report."""
-        recent_logs = list(self.log_buffer)[-50:]  # Last 50 logs
+        recent_logs = self._tail_logs(50)  # Last 50 logs
         
         return {
             "report_type": "detailed",
             "timestamp": datetime.utcnow().isoformat(),
             "summary": await self._generate_summary_report(),
-            "recent_logs": recent_logs,
-            "agent_status": self.agent_status
+            "recent_logs": [_export_times(entry) for entry in recent_logs],
+            "agent_status": self._export_agent_status()
         }
     
     async def _generate_agent_activity_report(self) -> Dict:
@@ -301,8 +376,18 @@ class AsyncLoggerAgent(AsyncBaseAgent):
         return {
             "report_type": "agent_activity",
             "timestamp": datetime.utcnow().isoformat(),
-            "agent_activity": self.agent_activity,
-            "agent_status": self.agent_status
+            "agent_activity": {
+                agent_id: _export_times(activity, ("first_seen", "last_activity"))
+                for agent_id, activity in self.agent_activity.items()
+            },
+            "agent_status": self._export_agent_status()
+        }
+    
+    def _export_agent_status(self) -> Dict:
+        """Agent status map with last_update formatted for reports."""
+        return {
+            agent_id: _export_times(status, ("last_update",))
+            for agent_id, status in self.agent_status.items()
         }
     
     async def _set_log_level(self, task_data: Dict):
@@ -313,8 +398,9 @@ class AsyncLoggerAgent(AsyncBaseAgent):
             if new_level in self.log_levels:
                 old_level = self.filter_level
                 self.filter_level = new_level
+                self._filter_index = self._level_index[new_level]
                 
-                logger.info(f"[{self.agent_id}] Log level changed from {old_level} to {new_level}")
+                logger.info("[%s] Log level changed from %s to %s", self.agent_id, old_level, new_level)
             else:
                 logger.error(f"[{self.agent_id}] Invalid log level: {new_level}")
                 
@@ -326,8 +412,9 @@ class AsyncLoggerAgent(AsyncBaseAgent):
         try:
             status_report = {
                 "timestamp": datetime.utcnow().isoformat(),
-                "agent_status": self.agent_status,
+                "agent_status": self._export_agent_status(),
                 "message_count": self.message_count,
+                "dropped_messages": self.dropped_messages,
                 "log_buffer_size": len(self.log_buffer),
                 "filter_level": self.filter_level
             }
@@ -336,11 +423,11 @@ class AsyncLoggerAgent(AsyncBaseAgent):
             status_message = self.create_message(
                 receiver_id=self.orchestrator_id,
                 msg_type=ACPMsgType.DATA_SUBMIT,
-                payload=DataSubmitPayload(
-                    data_type="logger_status",
-                    data=status_report,
-                    source="logger_agent"
-                ).model_dump()
+                payload={
+                    "data_type": "logger_status",
+                    "data": status_report,
+                    "source": "logger_agent"
+                }
             )
             
             await self.send_message(status_message)
@@ -350,12 +437,8 @@ class AsyncLoggerAgent(AsyncBaseAgent):
     
     def _should_log_level(self, log_level: str) -> bool:
         """Check if log level should be processed based on filter."""
-        try:
-            current_index = self.log_levels.index(self.filter_level)
-            log_index = self.log_levels.index(log_level)
-            return log_index >= current_index
-        except ValueError:
-            return True  # Log unknown levels
+        # Unknown levels sort above every known level, so they are always logged
+        return self._level_index.get(log_level, len(self.log_levels)) >= self._filter_index
     
     def get_capabilities(self) -> Dict[str, str]:
         """Return agent capabilities."""
@@ -7,17 +7,31 @@ Demonstrates A2A command and control patterns with async message handling.
 
 import asyncio
 import logging
-from typing import Dict, List, Any
+import random
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlsplit
 from datetime import datetime
 
+import orjson
+
 from .async_base_agent import AsyncBaseAgent, generate_task_id
-from ..protocols.acp_schema import (
-    ACPMessage, ACPMsgType, TaskAssignPayload, 
-    StatusUpdatePayload, DataSubmitPayload, LogBroadcastPayload
-)
+from ..protocols.acp_schema import ACPMessage, ACPMsgType
 
 logger = logging.getLogger(__name__)
 
+# Assumed extraction time (seconds) for domains without history, and the weight
+# of each new measurement in a domain's moving average
+DEFAULT_EXTRACTION_LATENCY = 1.0
+LATENCY_EMA_ALPHA = 0.3
+
+
+def _domain(url: str) -> str:
+    """Return the lowercased host of a URL."""
+    return urlsplit(url).netloc.lower()
+
 
 class AsyncOrchestratorAgent(AsyncBaseAgent):
     """
@@ -30,6 +44,20 @@ class AsyncOrchestratorAgent(AsyncBaseAgent):
     - Workflow state management
     """
     
+    # Number of search results whose content is extracted per workflow
+    max_extractions = 3
+    
+    # Queue inbound results; a burst past this is handled inline by the delivering call
+    inbox_size = 128
+    
+    # Seconds to wait for outstanding extractions before synthesizing with what has arrived
+    synthesis_debounce = 0.2
+    
+    # Failed-search retries: exponential backoff with jitter, capped per minute
+    retry_base_delay = 1.0
+    retry_max_delay = 30.0
+    max_retries_per_minute = 6
+    
     def __init__(self, agent_id: str, message_bus, mcp_servers: Dict[str, str]):
         """Initialize the async orchestrator agent."""
         super().__init__(agent_id, message_bus, mcp_servers)
@@ -39,27 +67,75 @@ class AsyncOrchestratorAgent(AsyncBaseAgent):
         self.current_task_id: str = ""
         self.search_results: List[Dict] = []
         self.extracted_content: List[Dict] = []
+        self._search_count = 0
+        self._extracted_count = 0
+        self._extractions_started = 0
+        self.content_chunks: Dict[str, List[str]] = {}
         self.synthesis_report: Dict = {}
         self.workflow_start_time: datetime = None
+        self._workflow_start_mono: float = None
         
         # Agent status tracking
         self.agent_status: Dict[str, str] = {}
+        self._agent_status_snapshot: Optional[Dict[str, str]] = None
+        
+        # Extraction round-trip times: moving average per domain, start time per pending URL
+        self._domain_latency: Dict[str, float] = {}
+        self._extraction_started_at: Dict[str, float] = {}
+        
+        # Pending search retry and recent retry times (monotonic) for rate limiting
+        self._retry_task: Optional[asyncio.Task] = None
+        self._retry_attempts = 0
+        self._retry_times: Deque[float] = deque()
+        
+        # One synthesis per workflow, dispatched when all extractions are in (or after a debounce)
+        self._synthesis_task: Optional[asyncio.Task] = None
+        self._synthesis_dispatched = False
+        self._all_extracted = asyncio.Event()
+        
+        # Message builders with the constant envelope fields pre-bound
+        self._assign_message = {
+            receiver_id: partial(self.create_message, receiver_id=receiver_id, msg_type=ACPMsgType.TASK_ASSIGN)
+            for receiver_id in ("search_agent", "extraction_agent", "file_save_agent")
+        }
+        self._log_message = partial(self.create_message, topic="logs", msg_type=ACPMsgType.LOG_BROADCAST)
+        
+        # Message type -> handler, and DATA_SUBMIT data_type -> handler
+        self._handlers = {
+            ACPMsgType.STATUS_UPDATE: self._handle_status_update,
+            ACPMsgType.DATA_SUBMIT: self._handle_data_submission
+        }
+        self._data_handlers = {
+            "search_results": self._handle_search_results,
+            "extracted_content": self._handle_extracted_content,
+            "synthesis_report": self._handle_synthesis_report
+        }
         
-        logger.info(f"[{self.agent_id}] Async Orchestrator initialized")
+        logger.info("[%s] Async Orchestrator initialized", self.agent_id)
     
     async def handle_message(self, message: ACPMessage):
         """Handle incoming ACP messages asynchronously."""
         try:
-            if message.msg_type == ACPMsgType.STATUS_UPDATE:
-                await self._handle_status_update(message)
-            elif message.msg_type == ACPMsgType.DATA_SUBMIT:
-                await self._handle_data_submission(message)
+            handler = self._handlers.get(message.msg_type)
+            if handler is not None:
+                await handler(message)
             else:
                 logger.warning(f"[{self.agent_id}] Unhandled message type: {message.msg_type.value}")
                 
         except Exception as e:
             logger.error(f"[{self.agent_id}] Error handling message: {e}")
     
+    async def stop(self):
+        """Cancel any pending search retry or synthesis dispatch, then stop the agent."""
+        self._cancel_pending_tasks()
+        await super().stop()
+    
+    def _cancel_pending_tasks(self):
+        """Cancel the delayed search retry and synthesis dispatch, if any."""
+        for task in (self._retry_task, self._synthesis_task):
+            if task is not None and not task.done():
+                task.cancel()
+    
     async def start_research(self, query: str):
         """
         Initiate a research workflow for the given query.
@@ -67,17 +143,27 @@ class AsyncOrchestratorAgent(AsyncBaseAgent):
         Args:
             query: Research question to investigate
         """
-        logger.info(f"[{self.agent_id}] Starting research workflow: '{query}'")
+        logger.info("[%s] Starting research workflow: '%s'", self.agent_id, query)
         
         # Initialize workflow state
         self.current_query = query
         self.current_task_id = generate_task_id()
         self.workflow_start_time = datetime.now()
+        self._workflow_start_mono = time.monotonic()
         
         # Reset collections
         self.search_results.clear()
         self.extracted_content.clear()
+        self.content_chunks.clear()
         self.synthesis_report.clear()
+        self._extraction_started_at.clear()
+        self._search_count = self._extracted_count = self._extractions_started = 0
+        
+        # A new workflow supersedes any retry or synthesis still waiting from the previous one
+        self._cancel_pending_tasks()
+        self._retry_attempts = 0
+        self._synthesis_dispatched = False
+        self._all_extracted.clear()
         
         # Broadcast workflow start
         await self._broadcast_log("INFO", f"Research workflow started: '{query}'")
@@ -93,102 +179,156 @@ class AsyncOrchestratorAgent(AsyncBaseAgent):
             "max_results": 5
         }
         
-        search_message = self.create_message(
-            receiver_id="search_agent",
-            msg_type=ACPMsgType.TASK_ASSIGN,
-            payload=TaskAssignPayload(
-                task_type="web_search",
-                task_data=task_data,
-                priority=1
-            ).model_dump()
-        )
+        search_message = self._assign_message["search_agent"](payload={
+            "task_type": "web_search",
+            "task_data": task_data,
+            "priority": 1
+        })
         
         await self.send_message(search_message)
-        logger.info(f"[{self.agent_id}] Assigned search task for: '{query}'")
+        logger.info("[%s] Assigned search task for: '%s'", self.agent_id, query)
     
     async def _handle_status_update(self, message: ACPMessage):
         """Process status updates from other agents."""
-        payload = StatusUpdatePayload(**message.payload)
+        # The envelope was validated on decode; read the payload fields directly
+        status = message.payload["status"]
         sender_id = message.sender_id
         
-        # Update agent status tracking
-        self.agent_status[sender_id] = payload.status
+        # Update agent status tracking; a change invalidates the reported snapshot
+        if self.agent_status.get(sender_id) != status:
+            self.agent_status[sender_id] = status
+            self._agent_status_snapshot = None
         
-        logger.info(f"[{self.agent_id}] Status from {sender_id}: {payload.status}")
+        logger.info("[%s] Status from %s: %s", self.agent_id, sender_id, status)
         
         # Handle specific status updates
-        if "failed" in payload.status.lower():
-            await self._handle_agent_failure(sender_id, payload.status)
+        if "failed" in status.lower():
+            await self._handle_agent_failure(sender_id, status)
     
     async def _handle_data_submission(self, message: ACPMessage):
         """Process data submissions from other agents."""
-        payload = DataSubmitPayload(**message.payload)
+        payload = message.payload
+        data_type = payload["data_type"]
         sender_id = message.sender_id
         
-        logger.info(f"[{self.agent_id}] Received {payload.data_type} from {sender_id}")
+        logger.info("[%s] Received %s from %s", self.agent_id, data_type, sender_id)
+        
+        # Streamed chunks are only buffered, so they skip the handler table
+        if data_type == "extracted_content_chunk":
+            self._buffer_content_chunk(payload["data"])
+            return
         
-        if payload.data_type == "search_results":
-            await self._handle_search_results(payload, sender_id)
-        elif payload.data_type == "extracted_content":
-            await self._handle_extracted_content(payload, sender_id)
-        elif payload.data_type == "synthesis_report":
-            await self._handle_synthesis_report(payload, sender_id)
+        handler = self._data_handlers.get(data_type)
+        if handler is not None:
+            await handler(payload["data"], sender_id)
         else:
-            logger.warning(f"[{self.agent_id}] Unknown data type: {payload.data_type}")
+            logger.warning(f"[{self.agent_id}] Unknown data type: {data_type}")
     
-    async def _handle_search_results(self, payload: DataSubmitPayload, sender_id: str):
+    async def _handle_search_results(self, search_data: Dict, sender_id: str):
         """Process search results and assign extraction tasks."""
-        search_data = payload.data
         results = search_data.get("results", [])
         
         self.search_results.extend(results)
+        self._search_count += len(results)
         
-        logger.info(f"[{self.agent_id}] Received {len(results)} search results")
+        logger.info("[%s] Received %s search results", self.agent_id, len(results))
         
-        # Assign extraction tasks for top results
-        extraction_tasks = []
-        for i, result in enumerate(results[:3]):  # Extract from top 3 results
+        # Assign extraction tasks as results arrive, until max_extractions sources are in flight;
+        # results submitted in several batches top up the same budget
+        sources = []
+        for result in results:
+            if self._extractions_started >= self.max_extractions:
+                break
             url = result.get("url", "")
             if url:
-                extraction_tasks.append(self._assign_extraction_task(url, f"source_{i+1}"))
+                self._extractions_started += 1
+                sources.append((url, f"source_{self._extractions_started}"))
+        
+        # Dispatch the historically fastest domains first so synthesis can start sooner
+        sources.sort(key=lambda source: self._domain_latency.get(_domain(source[0]), DEFAULT_EXTRACTION_LATENCY))
         
-        # Execute extraction tasks concurrently
-        if extraction_tasks:
-            await asyncio.gather(*extraction_tasks)
+        now = time.monotonic()
+        for url, _ in sources:
+            self._extraction_started_at[url] = now
+        
+        # Publish all extraction assignments concurrently
+        await self.send_messages([self._create_extraction_message(url, desc) for url, desc in sources])
+        for url, _ in sources:
+            logger.info("[%s] Assigned extraction task for: %s", self.agent_id, url)
     
-    async def _assign_extraction_task(self, url: str, source_desc: str):
-        """Assign content extraction task to ExtractionAgent."""
+    def _create_extraction_message(self, url: str, source_desc: str) -> ACPMessage:
+        """Build a content extraction task for ExtractionAgent."""
         task_data = {
             "url": url,
             "task_id": self.current_task_id,
             "source_description": source_desc
         }
         
-        extraction_message = self.create_message(
-            receiver_id="extraction_agent",
-            msg_type=ACPMsgType.TASK_ASSIGN,
-            payload=TaskAssignPayload(
-                task_type="extract_content",
-                task_data=task_data,
-                priority=2
-            ).model_dump()
-        )
-        
-        await self.send_message(extraction_message)
-        logger.info(f"[{self.agent_id}] Assigned extraction task for: {url}")
+        return self._assign_message["extraction_agent"](payload={
+            "task_type": "extract_content",
+            "task_data": task_data,
+            "priority": 2
+        })
     
-    async def _handle_extracted_content(self, payload: DataSubmitPayload, sender_id: str):
+    def _buffer_content_chunk(self, chunk_data: Dict):
+        """Store a streamed content chunk until its source's final message arrives."""
+        chunks = self.content_chunks.setdefault(chunk_data.get("url", ""), [])
+        index = chunk_data.get("chunk_index", len(chunks))
+        if index >= len(chunks):
+            chunks.extend([""] * (index + 1 - len(chunks)))
+        chunks[index] = chunk_data.get("content_chunk", "")
+    
+    async def _handle_extracted_content(self, content_data: Dict, sender_id: str):
         """Process extracted content and trigger synthesis when ready."""
-        content_data = payload.data
+        # Chunks and start times are keyed by the assigned URL, which survives redirects;
+        # drop the chunks even if the extraction failed
+        source_url = content_data.get("source_url", content_data.get("url", ""))
+        chunks = self.content_chunks.pop(source_url, None)
+        if chunks is not None and content_data.get("last_chunk"):
+            content_data["content"] = "".join(chunks)
         self.extracted_content.append(content_data)
+        self._extracted_count += 1
+        self._record_extraction_latency(source_url)
         
         content_length = content_data.get("word_count", 0)
-        logger.info(f"[{self.agent_id}] Received extracted content ({content_length} words)")
+        logger.info("[%s] Received extracted content (%s words)", self.agent_id, content_length)
+        
+        if self._extracted_count >= self._extractions_started:
+            self._all_extracted.set()
+        
+        # Once enough content is in, schedule a single synthesis for the workflow
+        if self._extracted_count >= 2 and not self._synthesis_dispatched:  # Wait for at least 2 sources
+            self._synthesis_dispatched = True
+            self._synthesis_task = asyncio.create_task(self._dispatch_synthesis(self.current_task_id))
+    
+    async def _dispatch_synthesis(self, task_id: str):
+        """
+        Assign synthesis once the remaining extractions arrive or the debounce window ends.
+        
+        Args:
+            task_id: Workflow the synthesis belongs to
+        """
+        try:
+            await asyncio.wait_for(self._all_extracted.wait(), timeout=self.synthesis_debounce)
+        except asyncio.TimeoutError:
+            logger.info("[%s] Starting synthesis without the remaining extractions", self.agent_id)
         
-        # If we have enough content, start synthesis
-        if len(self.extracted_content) >= 2:  # Wait for at least 2 sources
+        if task_id == self.current_task_id:
             await self._assign_synthesis_task()
     
+    def _record_extraction_latency(self, url: str):
+        """Fold an extraction's round-trip time into its domain's latency average (url as assigned)."""
+        started_at = self._extraction_started_at.pop(url, None)
+        if started_at is None:
+            return
+        
+        elapsed = time.monotonic() - started_at
+        domain = _domain(url)
+        previous = self._domain_latency.get(domain)
+        self._domain_latency[domain] = elapsed if previous is None else (
+            LATENCY_EMA_ALPHA * elapsed + (1 - LATENCY_EMA_ALPHA) * previous
+        )
+    
     async def _assign_synthesis_task(self):
         """Assign synthesis task to create the research report."""
         task_data = {
@@ -198,33 +338,37 @@ class AsyncOrchestratorAgent(AsyncBaseAgent):
             "task_id": self.current_task_id
         }
         
-        synthesis_message = self.create_message(
-            receiver_id="synthesis_agent",
-            msg_type=ACPMsgType.TASK_ASSIGN,
-            payload=TaskAssignPayload(
-                task_type="synthesize_research",
-                task_data=task_data,
-                priority=1
-            ).model_dump()
-        )
-        
-        await self.send_message(synthesis_message)
-        logger.info(f"[{self.agent_id}] Assigned synthesis task")
+        # Encode straight from the live lists: validating an ACPMessage would rebuild
+        # every search result and extracted document only to serialize them again
+        body = orjson.dumps({
+            "sender_id": self.agent_id,
+            "receiver_id": "synthesis_agent",
+            "topic": None,
+            "msg_type": ACPMsgType.TASK_ASSIGN.value,
+            "payload": {
+                "task_type": "synthesize_research",
+                "task_data": task_data,
+                "priority": 1
+            },
+            "timestamp": None
+        })
+        
+        await self.message_bus.publish_raw(body, receiver_id="synthesis_agent")
+        logger.info("[%s] Assigned synthesis task", self.agent_id)
     
-    async def _handle_synthesis_report(self, payload: DataSubmitPayload, sender_id: str):
+    async def _handle_synthesis_report(self, report_data: Dict, sender_id: str):
         """Process completed synthesis report and save to file."""
-        report_data = payload.data
         self.synthesis_report = report_data
         
         word_count = report_data.get("word_count", 0)
-        logger.info(f"[{self.agent_id}] Received synthesis report ({word_count} words)")
+        logger.info("[%s] Received synthesis report (%s words)", self.agent_id, word_count)
         
         # Assign file save task
         await self._assign_file_save_task(report_data)
     
     async def _assign_file_save_task(self, report_data: Dict):
         """Assign file save task to persist the final report."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = f"research_report_{timestamp}.md"
         file_path = f"output/reports/{filename}"
         
@@ -234,21 +378,18 @@ class AsyncOrchestratorAgent(AsyncBaseAgent):
             "task_id": self.current_task_id
         }
         
-        save_message = self.create_message(
-            receiver_id="file_save_agent",
-            msg_type=ACPMsgType.TASK_ASSIGN,
-            payload=TaskAssignPayload(
-                task_type="save_file",
-                task_data=task_data,
-                priority=1
-            ).model_dump()
-        )
-        
-        await self.send_message(save_message)
-        logger.info(f"[{self.agent_id}] Assigned file save task: {file_path}")
+        save_message = self._assign_message["file_save_agent"](payload={
+            "task_type": "save_file",
+            "task_data": task_data,
+            "priority": 1
+        })
         
-        # Broadcast workflow completion
-        await self._broadcast_workflow_completion()
+        # Assign the save and broadcast workflow completion together
+        await asyncio.gather(
+            self.send_message(save_message),
+            self._broadcast_workflow_completion()
+        )
+        logger.info("[%s] Assigned file save task: %s", self.agent_id, file_path)
     
     async def _handle_agent_failure(self, agent_id: str, error_status: str):
         """Handle agent failures and implement recovery strategies."""
@@ -257,30 +398,58 @@ class AsyncOrchestratorAgent(AsyncBaseAgent):
         await self._broadcast_log("WARNING", f"Agent {agent_id} failed: {error_status}")
         
         # Implement basic retry logic
-        if "search" in agent_id and len(self.search_results) == 0:
-            logger.info(f"[{self.agent_id}] Retrying search task due to failure")
-            await asyncio.sleep(5)  # Wait before retry
+        if "search" in agent_id and self._search_count == 0:
+            self._schedule_search_retry()
+    
+    def _schedule_search_retry(self):
+        """
+        Retry the current search after a backoff delay without blocking the inbox.
+        
+        The delay doubles per attempt within a workflow (with jitter so agents do
+        not retry in lockstep), and at most max_retries_per_minute retries start.
+        """
+        if self._retry_task is not None and not self._retry_task.done():
+            return
+        
+        now = time.monotonic()
+        while self._retry_times and now - self._retry_times[0] > 60.0:
+            self._retry_times.popleft()
+        if len(self._retry_times) >= self.max_retries_per_minute:
+            logger.warning(f"[{self.agent_id}] Search retry limit reached; not retrying")
+            return
+        self._retry_times.append(now)
+        
+        delay = min(self.retry_base_delay * 2 ** self._retry_attempts, self.retry_max_delay)
+        delay *= random.uniform(0.5, 1.0)
+        self._retry_attempts += 1
+        
+        logger.info("[%s] Retrying search task in %.1fs due to failure", self.agent_id, delay)
+        self._retry_task = asyncio.create_task(self._retry_search(delay, self.current_task_id))
+    
+    async def _retry_search(self, delay: float, task_id: str):
+        """Re-assign the search after ``delay`` if its workflow still has no results."""
+        await asyncio.sleep(delay)
+        if task_id == self.current_task_id and self._search_count == 0:
             await self._assign_search_task(self.current_query)
     
     async def _broadcast_log(self, level: str, message: str):
         """Broadcast log message to all subscribers."""
-        log_message = self.create_message(
-            topic="logs",
-            msg_type=ACPMsgType.LOG_BROADCAST,
-            payload=LogBroadcastPayload(
-                level=level,
-                message=message,
-                component=self.agent_id
-            ).model_dump()
-        )
-        
-        await self.send_message(log_message)
+        log_message = self._log_message(payload={
+            "level": level,
+            "message": message,
+            "component": self.agent_id
+        })
+        
+        # Nothing in the workflow waits on log delivery
+        await self.send_in_background(self.send_message(log_message))
     
     async def _broadcast_workflow_completion(self):
         """Broadcast workflow completion status."""
-        if self.workflow_start_time:
-            duration = datetime.now() - self.workflow_start_time
-            duration_str = str(duration).split('.')[0]  # Remove microseconds
+        if self._workflow_start_mono is not None:
+            # Whole seconds as H:MM:SS, measured on the monotonic clock
+            minutes, seconds = divmod(int(time.monotonic() - self._workflow_start_mono), 60)
+            hours, minutes = divmod(minutes, 60)
+            duration_str = f"{hours}:{minutes:02d}:{seconds:02d}"
         else:
             duration_str = "unknown"
         
@@ -288,24 +457,34 @@ class AsyncOrchestratorAgent(AsyncBaseAgent):
             f"Research workflow completed successfully! "
             f"Query: '{self.current_query}' | "
             f"Duration: {duration_str} | "
-            f"Sources: {len(self.extracted_content)} | "
+            f"Sources: {self._extracted_count} | "
             f"Report words: {self.synthesis_report.get('word_count', 0)}"
         )
         
         await self._broadcast_log("INFO", completion_message)
         
-        logger.info(f"[{self.agent_id}] 🎉 Workflow completed: {completion_message}")
+        logger.info("[%s] 🎉 Workflow completed: %s", self.agent_id, completion_message)
     
     def get_workflow_status(self) -> Dict[str, Any]:
-        """Get current workflow status and metrics."""
+        """
+        Get current workflow status and metrics.
+        
+        The agent_status mapping is a snapshot copied only when a status has
+        changed since the last call, so repeated polls share it; treat it as
+        read-only.
+        """
+        if self._agent_status_snapshot is None:
+            self._agent_status_snapshot = self.agent_status.copy()
+        
         return {
             "agent_id": self.agent_id,
             "current_query": self.current_query,
             "task_id": self.current_task_id,
             "workflow_start_time": self.workflow_start_time.isoformat() if self.workflow_start_time else None,
-            "search_results_count": len(self.search_results),
-            "extracted_content_count": len(self.extracted_content),
+            "search_results_count": self._search_count,
+            "extracted_content_count": self._extracted_count,
             "synthesis_complete": bool(self.synthesis_report),
-            "agent_status": self.agent_status.copy(),
+            "agent_status": self._agent_status_snapshot,
+            "inbox_depth": self.inbox.qsize(),
             "running": self.running
         }
@@ -4,14 +4,14 @@ Async Search Agent
 Agent responsible for finding information sources online using async MCP web search tools.
 """
 
+import asyncio
 import logging
+from functools import partial
 from typing import Dict
 
+from ._ttl_cache import TTLCache
 from .async_base_agent import AsyncBaseAgent, MCPClientMixin
-from ..protocols.acp_schema import (
-    ACPMessage, ACPMsgType, TaskAssignPayload, StatusUpdatePayload, 
-    DataSubmitPayload, LogBroadcastPayload
-)
+from ..protocols.acp_schema import ACPMessage, ACPMsgType
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,15 @@ class AsyncSearchAgent(AsyncBaseAgent, MCPClientMixin):
         
         self.orchestrator_id = "orchestrator"
         
-        logger.info(f"[{self.agent_id}] Async Search Agent initialized")
+        # Message builders with the constant envelope fields pre-bound
+        self._data_message = partial(self.create_message, receiver_id=self.orchestrator_id, msg_type=ACPMsgType.DATA_SUBMIT)
+        self._log_message = partial(self.create_message, topic="logs", msg_type=ACPMsgType.LOG_BROADCAST)
+        
+        # Recent and in-flight MCP searches, keyed by normalized query
+        self._search_cache = TTLCache(maxsize=256, ttl=300.0)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        logger.info("[%s] Async Search Agent initialized", self.agent_id)
     
     async def handle_message(self, message: ACPMessage):
         """Handle incoming ACP messages."""
@@ -50,12 +58,13 @@ class AsyncSearchAgent(AsyncBaseAgent, MCPClientMixin):
     async def _handle_task_assignment(self, message: ACPMessage):
         """Handle search task assignments."""
         try:
-            payload = TaskAssignPayload(**message.payload)
+            # The envelope was validated on decode; read the payload fields directly
+            task_type = message.payload["task_type"]
             
-            if payload.task_type == "web_search":
-                await self._perform_web_search(payload.task_data)
+            if task_type == "web_search":
+                await self._perform_web_search(message.payload["task_data"])
             else:
-                logger.warning(f"[{self.agent_id}] Unknown task type: {payload.task_type}")
+                logger.warning(f"[{self.agent_id}] Unknown task type: {task_type}")
                 
         except Exception as e:
             logger.error(f"[{self.agent_id}] Error in task assignment: {e}")
@@ -73,25 +82,14 @@ class AsyncSearchAgent(AsyncBaseAgent, MCPClientMixin):
             await self._send_error_status(error_msg)
             return
         
-        logger.info(f"[{self.agent_id}] Starting web search for: '{query}'")
+        logger.info("[%s] Starting web search for: '%s'", self.agent_id, query)
         
         try:
             # Send initial status update
             await self._send_status_update("searching", 10.0, task_id)
             
-            # Call MCP search tool
-            search_params = {
-                "query": query
-            }
-            
-            logger.debug(f"[{self.agent_id}] Calling MCP search tool with params: {search_params}")
-            
-            # Use async MCP call
-            result = await self.call_mcp_tool(
-                server_name="primary_tooling",
-                tool_name="search_web",
-                params=search_params
-            )
+            # Call MCP search tool (or reuse a recent result for the same query)
+            result = await self._search(query)
             
             # Process results
             results = result.get("results", [])
@@ -101,10 +99,7 @@ class AsyncSearchAgent(AsyncBaseAgent, MCPClientMixin):
             if max_results and len(results) > max_results:
                 results = results[:max_results]
             
-            logger.info(f"[{self.agent_id}] Search completed: {len(results)} results found")
-            
-            # Send progress update
-            await self._send_status_update("search_complete", 100.0, task_id)
+            logger.info("[%s] Search completed: %s results found", self.agent_id, len(results))
             
             # Send results to orchestrator
             search_data = {
@@ -114,33 +109,28 @@ class AsyncSearchAgent(AsyncBaseAgent, MCPClientMixin):
                 "result_count": len(results)
             }
             
-            data_message = self.create_message(
-                receiver_id=self.orchestrator_id,
-                msg_type=ACPMsgType.DATA_SUBMIT,
-                payload=DataSubmitPayload(
-                    data_type="search_results",
-                    data=search_data,
-                    source="web_search",
-                    task_id=task_id
-                ).model_dump()
-            )
-            
-            await self.send_message(data_message)
+            data_message = self._data_message(payload={
+                "data_type": "search_results",
+                "data": search_data,
+                "source": "web_search",
+                "task_id": task_id
+            })
             
             # Broadcast completion log
-            log_message = self.create_message(
-                topic="logs",
-                msg_type=ACPMsgType.LOG_BROADCAST,
-                payload=LogBroadcastPayload(
-                    level="INFO",
-                    message=f"Web search completed: '{query}' -> {len(results)} results",
-                    component=self.agent_id
-                ).model_dump()
+            log_message = self._log_message(payload={
+                "level": "INFO",
+                "message": f"Web search completed: '{query}' -> {len(results)} results",
+                "component": self.agent_id
+            })
+            
+            # Publish completion status and results together; the log goes out in the background
+            await asyncio.gather(
+                self._send_status_update("search_complete", 100.0, task_id),
+                self.send_message(data_message)
             )
+            await self.send_in_background(self.send_message(log_message))
             
-            await self.send_message(log_message)
-            
-            logger.info(f"[{self.agent_id}] Successfully completed search for: '{query}'")
+            logger.info("[%s] Successfully completed search for: '%s'", self.agent_id, query)
             
         except Exception as e:
             error_msg = f"Web search failed for '{query}': {e}"
@@ -150,32 +140,64 @@ class AsyncSearchAgent(AsyncBaseAgent, MCPClientMixin):
             await self._send_error_status(error_msg, task_id)
             
             # Broadcast error log
-            error_log = self.create_message(
-                topic="logs",
-                msg_type=ACPMsgType.LOG_BROADCAST,
-                payload=LogBroadcastPayload(
-                    level="ERROR",
-                    message=f"Web search failed: '{query}' - {error_msg}",
-                    component=self.agent_id
-                ).model_dump()
-            )
+            error_log = self._log_message(payload={
+                "level": "ERROR",
+                "message": f"Web search failed: '{query}' - {error_msg}",
+                "component": self.agent_id
+            })
             
-            await self.send_message(error_log)
+            await self.send_in_background(self.send_message(error_log))
+    
+    async def _search(self, query: str) -> Dict:
+        """
+        Run the MCP web search for a query, reusing recent and in-flight results.
+        
+        Results are cached on the query alone because max_results is applied
+        locally after the call.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Raw MCP search_web result
+        """
+        key = " ".join(query.lower().split())
+        
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            logger.info("[%s] Search cache hit for: '%s'", self.agent_id, query)
+            return cached
+        
+        # Concurrent identical queries share a single upstream call
+        search = self._inflight.get(key)
+        if search is None:
+            search_params = {
+                "query": query
+            }
+            
+            logger.debug("[%s] Calling MCP search tool with params: %s", self.agent_id, search_params)
+            
+            search = asyncio.create_task(self.call_mcp_tool(
+                server_name="primary_tooling",
+                tool_name="search_web",
+                params=search_params
+            ))
+            self._inflight[key] = search
+            try:
+                result = await search
+            finally:
+                self._inflight.pop(key, None)
+            
+            self._search_cache.set(key, result)
+            return result
+        
+        logger.info("[%s] Joining in-flight search for: '%s'", self.agent_id, query)
+        return await asyncio.shield(search)
     
     async def _send_status_update(self, status: str, progress: float = None, task_id: str = None):
         """Send status update to orchestrator."""
-        status_message = self.create_message(
-            receiver_id=self.orchestrator_id,
-            msg_type=ACPMsgType.STATUS_UPDATE,
-            payload=StatusUpdatePayload(
-                status=status,
-                progress=progress,
-                task_id=task_id
-            ).model_dump()
-        )
-        
-        await self.send_message(status_message)
-        logger.debug(f"[{self.agent_id}] Status update sent: {status}")
+        await self.publish_status_update(self.orchestrator_id, status, progress, task_id)
+        logger.debug("[%s] Status update sent: %s", self.agent_id, status)
     
     async def _send_error_status(self, error_message: str, task_id: str = None):
         """Send error status to orchestrator."""
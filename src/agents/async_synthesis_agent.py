@@ -5,17 +5,37 @@ Agent responsible for synthesizing research findings into coherent reports async
 Demonstrates MCP Sampling for AI-assisted text generation.
 """
 
+import asyncio
 import logging
-from typing import Dict, List
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 
 from .async_base_agent import AsyncBaseAgent, MCPClientMixin
-from ..protocols.acp_schema import (
-    ACPMessage, ACPMsgType, TaskAssignPayload, StatusUpdatePayload, 
-    DataSubmitPayload, LogBroadcastPayload
-)
+from ..protocols.acp_schema import ACPMessage, ACPMsgType
 
 logger = logging.getLogger(__name__)
 
+# Phrase substitutions applied, in order, by the simulated MCP Sampling improvement
+REPLACEMENTS = (
+    ("very good", "excellent"),
+    ("very bad", "problematic"),
+    ("a lot of", "numerous"),
+    ("thing", "element"),
+    ("stuff", "content"),
+    ("get", "obtain"),
+    ("make", "create"),
+    ("big", "substantial"),
+    ("small", "minimal")
+)
+
+# Runs of text between periods long enough to hold a >50-character sentence once stripped
+_KEY_POINT_CANDIDATE_RE = re.compile(r"[^.]{51,}")
+
 
 class AsyncSynthesisAgent(AsyncBaseAgent, MCPClientMixin):
     """
@@ -28,12 +48,29 @@ class AsyncSynthesisAgent(AsyncBaseAgent, MCPClientMixin):
     - Text improvement through iterative refinement
     """
     
+    # Maximum number of improved sentences kept for reuse across reports (exact match)
+    sentence_cache_size = 4096
+    
+    # Maximum number of sentence improvement requests in flight per report
+    improvement_concurrency = 32
+    
+    # Seconds intermediate status updates are buffered; only the latest one is sent
+    status_flush_interval = 0.05
+    
     def __init__(self, agent_id: str, message_bus, mcp_servers: Dict[str, str]):
         """Initialize the async synthesis agent."""
         AsyncBaseAgent.__init__(self, agent_id, message_bus, mcp_servers)
         MCPClientMixin.__init__(self)
         
         self.orchestrator_id = "orchestrator"
+        self._log_message = partial(self.create_message, topic="logs", msg_type=ACPMsgType.LOG_BROADCAST)
+        
+        # Sentence -> improved sentence from previous MCP Sampling calls
+        self._sentence_cache: "OrderedDict[str, str]" = OrderedDict()
+        
+        # Latest buffered (status, progress) per task_id, and the task that will publish them
+        self._pending_status: Dict[Optional[str], Tuple[str, Optional[float]]] = {}
+        self._status_flush_task: Optional[asyncio.Task] = None
         
         logger.info(f"[{self.agent_id}] Async Synthesis Agent initialized")
     
@@ -51,12 +88,12 @@ class AsyncSynthesisAgent(AsyncBaseAgent, MCPClientMixin):
     async def _handle_task_assignment(self, message: ACPMessage):
         """Handle synthesis task assignments."""
         try:
-            payload = TaskAssignPayload(**message.payload)
+            task_type = message.payload["task_type"]
             
-            if payload.task_type == "synthesize_research":
-                await self._synthesize_research_report(payload.task_data)
+            if task_type == "synthesize_research":
+                await self._synthesize_research_report(message.payload["task_data"])
             else:
-                logger.warning(f"[{self.agent_id}] Unknown task type: {payload.task_type}")
+                logger.warning(f"[{self.agent_id}] Unknown task type: {task_type}")
                 
         except Exception as e:
             logger.error(f"[{self.agent_id}] Error in task assignment: {e}")
@@ -69,6 +106,9 @@ class AsyncSynthesisAgent(AsyncBaseAgent, MCPClientMixin):
         extracted_content = task_data.get("extracted_content", [])
         task_id = task_data.get("task_id", "unknown")
         
+        # Filter the successful extractions once for every section that needs them
+        successful_extractions = [c for c in extracted_content if c.get("extraction_successful", False)]
+        
         if not query:
             error_msg = "No research query provided for synthesis"
             logger.error(f"[{self.agent_id}] {error_msg}")
@@ -81,43 +121,45 @@ class AsyncSynthesisAgent(AsyncBaseAgent, MCPClientMixin):
             # Send initial status update
             await self._send_status_update("synthesis_starting", 10.0, task_id)
             
-            # Create the report structure
-            report_sections = []
+            # Draft the sections whose prose is improved: (title, text)
+            drafts = []
             
             # Introduction
             await self._send_status_update("creating_introduction", 20.0, task_id)
-            intro = await self._create_introduction(query)
-            improved_intro = await self._improve_text_with_mcp(intro)
-            report_sections.append(f"## Introduction\\n\\n{improved_intro}")
+            drafts.append(("Introduction", self._create_introduction(query)))
             
             # Findings from each source
             await self._send_status_update("analyzing_sources", 40.0, task_id)
             for i, content in enumerate(extracted_content):
                 if content.get("extraction_successful", False):
-                    section_title = f"Source {i+1} Analysis"
-                    section_content = await self._create_source_analysis(content)
-                    improved_content = await self._improve_text_with_mcp(section_content)
-                    report_sections.append(f"## {section_title}\\n\\n{improved_content}")
+                    drafts.append((f"Source {i+1} Analysis", self._create_source_analysis(content)))
             
             # Synthesis and conclusions
             await self._send_status_update("creating_synthesis", 70.0, task_id)
-            conclusion = await self._create_conclusion(query, extracted_content)
-            improved_conclusion = await self._improve_text_with_mcp(conclusion)
-            report_sections.append(f"## Synthesis and Conclusions\\n\\n{improved_conclusion}")
+            drafts.append(("Synthesis and Conclusions", self._create_conclusion(query, successful_extractions)))
+            
+            # Improve every drafted section in one batch
+            improved_texts = await self._improve_texts([text for _, text in drafts])
+            report_sections = [
+                f"## {section_title}\\n\\n{improved_text}"
+                for (section_title, _), improved_text in zip(drafts, improved_texts)
+            ]
             
             # Methodology and sources
             await self._send_status_update("adding_metadata", 90.0, task_id)
-            methodology = await self._create_methodology(search_results, extracted_content)
+            methodology = self._create_methodology(search_results, successful_extractions)
             report_sections.append(f"## Research Methodology\\n\\n{methodology}")
             
-            # Combine all sections
-            full_report = f"# Research Report: {query}\\n\\n" + "\\n\\n".join(report_sections)
-            
-            # Add metadata
-            metadata = await self._create_metadata(search_results, extracted_content)
-            full_report += f"\\n\\n## Research Metadata\\n\\n{metadata}"
+            # Combine the title, all sections and the metadata in a single join
+            metadata = self._create_metadata(search_results, successful_extractions)
+            full_report = "\\n\\n".join([
+                f"# Research Report: {query}",
+                *report_sections,
+                f"## Research Metadata\\n\\n{metadata}"
+            ])
+            word_count = len(full_report.split())
             
-            logger.info(f"[{self.agent_id}] Synthesis completed: {len(full_report.split())} words")
+            logger.info("[%s] Synthesis completed: %s words", self.agent_id, word_count)
             
             # Send completion status
             await self._send_status_update("synthesis_complete", 100.0, task_id)
@@ -125,35 +167,36 @@ class AsyncSynthesisAgent(AsyncBaseAgent, MCPClientMixin):
             # Send completed report
             synthesis_data = {
                 "report_content": full_report,
-                "word_count": len(full_report.split()),
+                "word_count": word_count,
                 "sections": len(report_sections),
-                "sources_analyzed": len([c for c in extracted_content if c.get("extraction_successful", False)]),
+                "sources_analyzed": len(successful_extractions),
                 "query": query
             }
             
-            data_message = self.create_message(
-                receiver_id=self.orchestrator_id,
-                msg_type=ACPMsgType.DATA_SUBMIT,
-                payload=DataSubmitPayload(
-                    data_type="synthesis_report",
-                    data=synthesis_data,
-                    source="synthesis_engine",
-                    task_id=task_id
-                ).model_dump()
-            )
+            # Encode with orjson: it is several times faster than pydantic's
+            # serializer on the multi-KB report text
+            body = orjson.dumps({
+                "sender_id": self.agent_id,
+                "receiver_id": self.orchestrator_id,
+                "topic": None,
+                "msg_type": ACPMsgType.DATA_SUBMIT.value,
+                "payload": {
+                    "data_type": "synthesis_report",
+                    "data": synthesis_data,
+                    "source": "synthesis_engine",
+                    "task_id": task_id
+                },
+                "timestamp": None
+            })
             
-            await self.send_message(data_message)
+            await self.message_bus.publish_raw(body, receiver_id=self.orchestrator_id)
             
             # Broadcast completion log
-            log_message = self.create_message(
-                topic="logs",
-                msg_type=ACPMsgType.LOG_BROADCAST,
-                payload=LogBroadcastPayload(
-                    level="INFO",
-                    message=f"Research report synthesized: {len(full_report.split())} words, {len(extracted_content)} sources",
-                    component=self.agent_id
-                ).model_dump()
-            )
+            log_message = self._log_message(payload={
+                "level": "INFO",
+                "message": f"Research report synthesized: {word_count} words, {len(extracted_content)} sources",
+                "component": self.agent_id
+            })
             
             await self.send_message(log_message)
             
@@ -162,13 +205,13 @@ class AsyncSynthesisAgent(AsyncBaseAgent, MCPClientMixin):
             logger.error(f"[{self.agent_id}] {error_msg}")
             await self._send_error_status(error_msg, task_id)
     
-    async def _create_introduction(self, query: str) -> str:
+    def _create_introduction(self, query: str) -> str:
         """Create an introduction section for the report."""
         return f"""This research report investigates the question: "{query}". 
 
 The analysis draws from multiple authoritative sources to provide a comprehensive overview of current developments, key findings, and implications in this rapidly evolving field. Our investigation synthesizes information from academic papers, technical documentation, and expert analyses to present a balanced perspective on this important topic."""
     
-    async def _create_source_analysis(self, content_data: Dict) -> str:
+    def _create_source_analysis(self, content_data: Dict) -> str:
         """Create analysis text for a single source."""
         url = content_data.get("url", "Unknown source")
         title = content_data.get("title", "Untitled")
@@ -176,7 +219,7 @@ The analysis draws from multiple authoritative sources to provide a comprehensiv
         word_count = content_data.get("word_count", 0)
         
         # Extract key points from content
-        key_points = await self._extract_key_points(content)
+        key_points = self._extract_key_points(content)
         
         analysis = f"""**Source**: [{title}]({url})
 
@@ -190,23 +233,24 @@ This source provides valuable perspective on the research question through detai
         
         return analysis
     
-    async def _extract_key_points(self, content: str) -> str:
+    def _extract_key_points(self, content: str) -> str:
         """Extract key points from content."""
-        # Simple key point extraction
-        sentences = [s.strip() for s in content.split('.') if len(s.strip()) > 50]
-        
-        # Take first few substantial sentences as key points
-        key_sentences = sentences[:3]
+        # Take the first few substantial sentences as key points, stopping once found
+        key_sentences = []
+        for match in _KEY_POINT_CANDIDATE_RE.finditer(content):
+            sentence = match.group(0).strip()
+            if len(sentence) > 50:
+                key_sentences.append(sentence)
+                if len(key_sentences) == 3:
+                    break
         
         if key_sentences:
             return '\\n\\n'.join([f"• {sentence}." for sentence in key_sentences])
         else:
             return "• Content provides technical background and context for the research question."
     
-    async def _create_conclusion(self, query: str, extracted_content: List[Dict]) -> str:
-        """Create synthesis and conclusions section."""
-        successful_extractions = [c for c in extracted_content if c.get("extraction_successful", False)]
-        
+    def _create_conclusion(self, query: str, successful_extractions: List[Dict]) -> str:
+        """Create synthesis and conclusions section from the successful extractions."""
         conclusion = f"""Based on our analysis of {len(successful_extractions)} authoritative sources, several key themes emerge regarding {query}:
 
 **Primary Findings**:
@@ -227,22 +271,21 @@ This analysis highlights several areas where additional investigation would be v
         
         return conclusion
     
-    async def _create_methodology(self, search_results: List[Dict], extracted_content: List[Dict]) -> str:
-        """Create methodology section."""
+    def _create_methodology(self, search_results: List[Dict], successful_extractions: List[Dict]) -> str:
+        """Create methodology section from the successful extractions."""
         return f"""**Research Methodology**:
 
 This report was generated through a systematic multi-stage process:
 
 1. **Information Discovery**: Conducted web search yielding {len(search_results)} relevant sources
-2. **Content Extraction**: Successfully extracted content from {len([c for c in extracted_content if c.get("extraction_successful", False)])} sources
+2. **Content Extraction**: Successfully extracted content from {len(successful_extractions)} sources
 3. **Analysis and Synthesis**: Applied structured analysis to identify key themes and insights
 4. **Report Generation**: Synthesized findings into coherent narrative with supporting evidence
 
 **Source Quality**: All sources were selected based on relevance and authority in the field."""
     
-    async def _create_metadata(self, search_results: List[Dict], extracted_content: List[Dict]) -> str:
-        """Create metadata section."""
-        successful_extractions = [c for c in extracted_content if c.get("extraction_successful", False)]
+    def _create_metadata(self, search_results: List[Dict], successful_extractions: List[Dict]) -> str:
+        """Create metadata section from the successful extractions."""
         total_words = sum(c.get("word_count", 0) for c in successful_extractions)
         
         source_list = "\\n".join([
@@ -258,70 +301,133 @@ This report was generated through a systematic multi-stage process:
 **Sources**:
 {source_list}
 
-**Generation Date**: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC"""
+**Generation Date**: {datetime.now(timezone.utc).replace(tzinfo=None).isoformat(' ', 'seconds')} UTC"""
     
     async def _improve_text_with_mcp(self, text: str) -> str:
         """Improve text using MCP Sampling for sentence rephrasing."""
+        return (await self._improve_texts([text]))[0]
+    
+    async def _improve_texts(self, texts: List[str]) -> List[str]:
+        """
+        Improve several texts with one batch of MCP Sampling requests.
+        
+        Eligible sentences from all texts are deduplicated and improved
+        concurrently (at most ``improvement_concurrency`` at a time), then
+        scattered back into their texts.
+        
+        Args:
+            texts: Texts to improve
+            
+        Returns:
+            Improved texts, in the same order
+        """
         try:
-            sentences = text.split(". ")
-            improved_sentences = []
+            split_texts = [[sentence.strip() for sentence in text.split(". ")] for text in texts]
+            
+            # Only improve longer sentences
+            pending = list(dict.fromkeys(
+                sentence for sentences in split_texts for sentence in sentences if len(sentence) > 50
+            ))
+            
+            limit = asyncio.Semaphore(self.improvement_concurrency)
             
-            for sentence in sentences:
-                sentence = sentence.strip()
-                if len(sentence) > 50:  # Only improve longer sentences
+            async def improve(sentence: str) -> str:
+                async with limit:
                     try:
                         # MCP Sampling: Request AI assistance (simulated)
-                        improved_sentence = await self._simulate_text_improvement(sentence)
-                        improved_sentences.append(improved_sentence)
+                        return await self._improve_sentence(sentence)
                     except Exception as e:
-                        logger.debug(f"[{self.agent_id}] Text improvement failed for sentence, using original: {e}")
-                        improved_sentences.append(sentence)
-                else:
-                    improved_sentences.append(sentence)
+                        logger.debug("[%s] Text improvement failed for sentence, using original: %s", self.agent_id, e)
+                        return sentence
             
-            return ". ".join(improved_sentences)
+            improved = dict(zip(pending, await asyncio.gather(*(improve(sentence) for sentence in pending))))
+            
+            return [
+                ". ".join(improved.get(sentence, sentence) for sentence in sentences)
+                for sentences in split_texts
+            ]
             
         except Exception as e:
             logger.warning(f"[{self.agent_id}] Text improvement failed, returning original: {e}")
-            return text
+            return list(texts)
+    
+    async def _improve_sentence(self, sentence: str) -> str:
+        """
+        Improve a sentence, reusing the result for sentences seen before.
+        
+        Args:
+            sentence: Sentence to improve
+            
+        Returns:
+            Improved sentence
+        """
+        improved = self._sentence_cache.get(sentence)
+        if improved is not None:
+            self._sentence_cache.move_to_end(sentence)
+            return improved
+        
+        improved = await self._simulate_text_improvement(sentence)
+        
+        self._sentence_cache[sentence] = improved
+        if len(self._sentence_cache) > self.sentence_cache_size:
+            self._sentence_cache.popitem(last=False)
+        
+        return improved
     
     async def _simulate_text_improvement(self, text: str) -> str:
         """Simulate MCP Sampling text improvement."""
         # In production, this would call the UserInteractionServer
-        # For now, apply simple improvements
+        # For now, apply simple improvements. str.replace returns the input
+        # unchanged when a phrase is absent, and for sentence-sized text these
+        # C-level scans beat a single regex pass with a Python callback.
         improved = text
-        
-        replacements = {
-            "very good": "excellent",
-            "very bad": "problematic",
-            "a lot of": "numerous",
-            "thing": "element",
-            "stuff": "content",
-            "get": "obtain",
-            "make": "create",
-            "big": "substantial",
-            "small": "minimal"
-        }
-        
-        for old, new in replacements.items():
+        for old, new in REPLACEMENTS:
             improved = improved.replace(old, new)
         
         return improved
     
+    async def stop(self):
+        """Drop any buffered status update, then stop the agent."""
+        if self._status_flush_task is not None and not self._status_flush_task.done():
+            self._status_flush_task.cancel()
+        self._pending_status.clear()
+        await super().stop()
+    
     async def _send_status_update(self, status: str, progress: float = None, task_id: str = None):
-        """Send status update to orchestrator."""
-        status_message = self.create_message(
-            receiver_id=self.orchestrator_id,
-            msg_type=ACPMsgType.STATUS_UPDATE,
-            payload=StatusUpdatePayload(
-                status=status,
-                progress=progress,
-                task_id=task_id
-            ).model_dump()
-        )
+        """
+        Send status update to orchestrator.
         
-        await self.send_message(status_message)
-        logger.debug(f"[{self.agent_id}] Status update sent: {status}")
+        Intermediate updates are buffered for ``status_flush_interval`` seconds
+        and only the latest one per task is published. Terminal states (complete
+        or failed) supersede anything buffered for their task and are published
+        immediately.
+        """
+        if status == "synthesis_complete" or status.startswith("synthesis_failed"):
+            self._pending_status.pop(task_id, None)
+            await self.publish_status_update(self.orchestrator_id, status, progress, task_id)
+            logger.debug("[%s] Status update sent: %s", self.agent_id, status)
+            return
+        
+        self._pending_status[task_id] = (status, progress)
+        if self._status_flush_task is None:
+            self._status_flush_task = asyncio.create_task(self._flush_status())
+            self._status_flush_task.add_done_callback(self._status_flush_done)
+    
+    async def _flush_status(self):
+        """Publish the latest buffered status update of each task after the flush interval."""
+        try:
+            await asyncio.sleep(self.status_flush_interval)
+            pending, self._pending_status = self._pending_status, {}
+            for task_id, (status, progress) in pending.items():
+                await self.publish_status_update(self.orchestrator_id, status, progress, task_id)
+                logger.debug("[%s] Status update sent: %s", self.agent_id, status)
+        finally:
+            self._status_flush_task = None
+    
+    def _status_flush_done(self, task: asyncio.Task):
+        """Log a status flush that failed, since nothing awaits the flush task."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"[{self.agent_id}] Buffered status update failed: {task.exception()}")
     
     async def _send_error_status(self, error_message: str, task_id: str = None):
         """Send error status to orchestrator."""
@@ -4,6 +4,7 @@ FastAPI Filesystem MCP Server
 Provides secure file operations with MCP Roots security model via HTTP endpoints.
 """
 
+import asyncio
 import os
 import time
 from pathlib import Path
@@ -11,6 +12,7 @@ from typing import Dict, Any, List
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import aiofiles
+import aiofiles.os
 
 # Prometheus monitoring
 from prometheus_fastapi_instrumentator import Instrumentator
@@ -115,8 +117,8 @@ def create_filesystem_app() -> FastAPI:
         """
         print(f"[FileSystemServer] HTTP: Attempting to save file: {params.file_path}")
         
-        # Critical security check using MCP Roots model
-        if not _is_path_allowed(params.file_path):
+        # Critical security check using MCP Roots model (path resolution hits the disk)
+        if not await asyncio.to_thread(_is_path_allowed, params.file_path):
             error_msg = (
                 f"Access denied: '{params.file_path}' is outside allowed roots. "
                 f"Allowed roots: {[str(r) for r in allowed_roots]}"
@@ -125,18 +127,18 @@ def create_filesystem_app() -> FastAPI:
             raise HTTPException(status_code=403, detail=error_msg)
         
         try:
-            # Resolve the full path
-            target_path = Path(params.file_path).resolve()
+            # Resolve the full path off the event loop
+            target_path = await asyncio.to_thread(Path(params.file_path).resolve)
             
             # Ensure parent directory exists
-            target_path.parent.mkdir(parents=True, exist_ok=True)
+            await aiofiles.os.makedirs(target_path.parent, exist_ok=True)
             
             # Write the content asynchronously
             async with aiofiles.open(target_path, 'w', encoding='utf-8') as f:
                 await f.write(params.content)
             
             # Get file size for response
-            file_size = target_path.stat().st_size
+            file_size = (await aiofiles.os.stat(target_path)).st_size
             
             response = SaveFileResponse(
                 success=True,
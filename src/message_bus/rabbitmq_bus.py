@@ -6,10 +6,10 @@ Supports both direct agent-to-agent communication and topic-based broadcasting.
 """
 
 import asyncio
-import json
 import logging
-from typing import Callable, Dict, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 from urllib.parse import urlparse
+import orjson
 import pika
 from pika.adapters.asyncio_connection import AsyncioConnection
 from pika.exceptions import AMQPConnectionError
@@ -49,6 +49,10 @@ class RabbitMQBus:
         # Subscriber tracking
         self.agent_subscribers: Dict[str, Callable] = {}
         self.topic_subscribers: Dict[str, Set[Callable]] = {}
+        # Dedicated consumer channels for agents with their own prefetch (basic_qos is per channel)
+        self.agent_channels: Dict[str, Any] = {}
+        # Coroutine-function callbacks, resolved once at subscribe time -> live subscriptions
+        self._coroutine_callbacks: Dict[Callable, int] = {}
         
         # Connection management
         self._connection_attempts = 0
@@ -159,7 +163,10 @@ class RabbitMQBus:
             raise RuntimeError("Not connected to RabbitMQ")
         
         try:
-            message_body = message.model_dump_json()
+            # pydantic's Rust serializer already beats orjson over model_dump() for
+            # ordinary messages; senders of multi-KB text pre-encode with orjson
+            # and use publish_raw instead
+            message_body = message.model_dump_json().encode()
             
             if message.receiver_id:
                 # Direct message to specific agent
@@ -178,7 +185,62 @@ class RabbitMQBus:
             logger.error(f"Failed to publish message: {e}")
             raise
     
-    async def _publish_direct(self, routing_key: str, message_body: str):
+    async def publish_batch(self, messages: List[ACPMessage]):
+        """
+        Publish several ACP messages in one bus call.
+        
+        All bodies are encoded before the first publish, so a fan-out is one
+        pass over the channel rather than one encode/publish round per message.
+        
+        Args:
+            messages: ACP messages to publish
+        """
+        if not self.is_connected:
+            raise RuntimeError("Not connected to RabbitMQ")
+        
+        publishes = []
+        for message in messages:
+            message_body = message.model_dump_json().encode()
+            if message.receiver_id:
+                publishes.append(self._publish_direct(message.receiver_id, message_body))
+            elif message.topic:
+                publishes.append(self._publish_topic(message.topic, message_body))
+            else:
+                for publish in publishes:
+                    publish.close()
+                raise ValueError("Message must have either receiver_id or topic")
+        
+        try:
+            # Mock delivery awaits the subscriber, so keep the deliveries overlapped
+            await asyncio.gather(*publishes)
+            logger.debug(f"Published batch of {len(publishes)} messages")
+        except Exception as e:
+            logger.error(f"Failed to publish message batch: {e}")
+            raise
+    
+    async def publish_raw(self, message_body: bytes, receiver_id: str = None, topic: str = None):
+        """
+        Publish an already-serialized ACP message body.
+        
+        Used by hot paths that pre-encode their JSON and would otherwise pay
+        for a pydantic round-trip in publish_message.
+        
+        Args:
+            message_body: JSON-encoded ACP message
+            receiver_id: Target agent ID for direct messages
+            topic: Topic name for broadcast messages
+        """
+        if not self.is_connected:
+            raise RuntimeError("Not connected to RabbitMQ")
+        
+        if receiver_id:
+            await self._publish_direct(receiver_id, message_body)
+        elif topic:
+            await self._publish_topic(topic, message_body)
+        else:
+            raise ValueError("Message must have either receiver_id or topic")
+    
+    async def _publish_direct(self, routing_key: str, message_body: bytes):
         """Publish message to direct exchange."""
         # Mock implementation - in production, use actual channel.basic_publish
         logger.debug(f"Publishing to direct exchange: {routing_key}")
@@ -186,42 +248,60 @@ class RabbitMQBus:
         # Simulate message delivery to subscribers
         if routing_key in self.agent_subscribers:
             callback = self.agent_subscribers[routing_key]
-            message = ACPMessage.model_validate_json(message_body)
+            message = self._decode_message(message_body)
             await self._invoke_callback(callback, message)
     
-    async def _publish_topic(self, routing_key: str, message_body: str):
+    async def _publish_topic(self, routing_key: str, message_body: bytes):
         """Publish message to topic exchange."""
         # Mock implementation - in production, use actual channel.basic_publish
         logger.debug(f"Publishing to topic exchange: {routing_key}")
         
         # Simulate message delivery to topic subscribers
         if routing_key in self.topic_subscribers:
-            message = ACPMessage.model_validate_json(message_body)
+            message = self._decode_message(message_body)
             for callback in self.topic_subscribers[routing_key]:
                 await self._invoke_callback(callback, message)
     
+    @staticmethod
+    def _decode_message(message_body: bytes) -> ACPMessage:
+        """Decode a message body, parsing the JSON with orjson before validation."""
+        return ACPMessage.model_validate(orjson.loads(message_body))
+    
     async def _invoke_callback(self, callback: Callable, message: ACPMessage):
         """Safely invoke message callback with error handling."""
         try:
-            if asyncio.iscoroutinefunction(callback):
+            if callback in self._coroutine_callbacks:
                 await callback(message)
             else:
                 callback(message)
         except Exception as e:
             logger.error(f"Error in message callback: {e}")
     
-    async def subscribe_agent(self, agent_id: str, callback: Callable):
+    async def subscribe_agent(self, agent_id: str, callback: Callable,
+                              prefetch_count: Optional[int] = None):
         """
         Subscribe an agent to receive direct messages.
         
         Args:
             agent_id: Unique agent identifier
             callback: Async function to handle incoming messages
+            prefetch_count: Optional consumer prefetch (basic_qos), applied on a channel of the agent's own
         """
         if not self.is_connected:
             raise RuntimeError("Not connected to RabbitMQ")
         
+        if prefetch_count:
+            # QoS on the shared channel would be overwritten by the next subscriber,
+            # so each agent with a prefetch limit consumes on its own channel
+            channel = await self.connection.channel()
+            await channel.basic_qos(prefetch_count=prefetch_count)
+            self.agent_channels[agent_id] = channel
+        
+        previous = self.agent_subscribers.get(agent_id)
+        if previous is not None:
+            self._unregister_callback(previous)
         self.agent_subscribers[agent_id] = callback
+        self._register_callback(callback)
         
         # In production, this would create a queue and bind it to the direct exchange
         logger.info(f"Agent {agent_id} subscribed to direct messages")
@@ -240,21 +320,44 @@ class RabbitMQBus:
         if topic not in self.topic_subscribers:
             self.topic_subscribers[topic] = set()
         
-        self.topic_subscribers[topic].add(callback)
+        if callback not in self.topic_subscribers[topic]:
+            self.topic_subscribers[topic].add(callback)
+            self._register_callback(callback)
         
         # In production, this would create a queue and bind it to the topic exchange
         logger.info(f"Subscribed to topic: {topic}")
     
+    def _register_callback(self, callback: Callable):
+        """Record whether a callback must be awaited so deliveries skip the check."""
+        if asyncio.iscoroutinefunction(callback):
+            self._coroutine_callbacks[callback] = self._coroutine_callbacks.get(callback, 0) + 1
+    
+    def _unregister_callback(self, callback: Callable):
+        """Drop one subscription of a callback, forgetting it once none remain."""
+        count = self._coroutine_callbacks.get(callback)
+        if count is None:
+            return
+        if count > 1:
+            self._coroutine_callbacks[callback] = count - 1
+        else:
+            del self._coroutine_callbacks[callback]
+    
     async def unsubscribe_agent(self, agent_id: str):
         """Unsubscribe an agent from direct messages."""
+        channel = self.agent_channels.pop(agent_id, None)
+        if channel is not None:
+            await channel.close()
+        
         if agent_id in self.agent_subscribers:
-            del self.agent_subscribers[agent_id]
+            self._unregister_callback(self.agent_subscribers.pop(agent_id))
             logger.info(f"Agent {agent_id} unsubscribed from direct messages")
     
     async def unsubscribe_topic(self, topic: str, callback: Callable):
         """Unsubscribe from topic broadcasts."""
         if topic in self.topic_subscribers:
-            self.topic_subscribers[topic].discard(callback)
+            if callback in self.topic_subscribers[topic]:
+                self.topic_subscribers[topic].discard(callback)
+                self._unregister_callback(callback)
             if not self.topic_subscribers[topic]:
                 del self.topic_subscribers[topic]
             logger.info(f"Unsubscribed from topic: {topic}")
@@ -273,6 +376,17 @@ class RabbitMQBus:
 class MockChannel:
     """Mock channel for development/testing purposes."""
     
+    def __init__(self):
+        self.prefetch_count = 0
+    
+    async def basic_qos(self, prefetch_count=0):
+        """Mock consumer prefetch configuration."""
+        self.prefetch_count = prefetch_count
+    
+    async def close(self):
+        """Mock channel close."""
+        pass
+    
     async def basic_publish(self, exchange, routing_key, body, properties=None):
         """Mock message publishing."""
         pass
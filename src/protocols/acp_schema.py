@@ -3,6 +3,11 @@ Agent Communication Protocol (ACP) Schema Definitions
 
 This module defines the Pydantic models for structured communication
 between agents in the Project Synapse system.
+
+The envelope (ACPMessage) is validated once when the bus decodes a message.
+The payload models document the wire format; agent hot paths build payloads
+as plain dicts of the same shape and, where it pays off, encode them directly
+with orjson instead of instantiating these models.
 """
 
 from enum import Enum
@@ -0,0 +1,12 @@
+"""
+Unit test configuration.
+
+Makes the repository root importable so tests can import the ``src`` package
+the same way the entry points do. pytest-asyncio is optional here: async
+tests drive their own event loop with ``asyncio.run``.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
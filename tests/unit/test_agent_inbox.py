@@ -0,0 +1,196 @@
+"""
+Unit tests for the AsyncBaseAgent inbox.
+
+The mock bus delivers messages inline, so an inbox consumer can end up waiting
+on its own deliveries. These tests push more than ``inbox_size`` messages
+through a single call chain and check that nothing deadlocks or reorders.
+"""
+
+import asyncio
+
+from src.agents import (
+    AsyncBaseAgent, AsyncExtractionAgent, AsyncFileSaveAgent, AsyncOrchestratorAgent,
+    AsyncSearchAgent, AsyncSynthesisAgent
+)
+from src.message_bus.rabbitmq_bus import RabbitMQBus
+from src.protocols.acp_schema import ACPMessage, ACPMsgType
+
+MCP_SERVERS = {"primary_tooling": "http://mcp.test", "filesystem": "http://fs.test"}
+
+CONTENT = "Quantum computing is a very good thing that will break encryption algorithms soon. " * 20
+
+
+class EchoAgent(AsyncBaseAgent):
+    """Agent whose first message makes it send a burst of messages to itself."""
+
+    inbox_size = 4
+
+    def __init__(self, agent_id, message_bus, burst: int):
+        super().__init__(agent_id, message_bus, {})
+        self.burst = burst
+        self.received = []
+
+    async def handle_message(self, message: ACPMessage):
+        self.received.append(message.payload["n"])
+        if message.payload["n"] == 0:
+            # Each send is delivered back into this agent's inbox inline
+            for n in range(1, self.burst + 1):
+                await self.send_message(self.create_message(
+                    receiver_id=self.agent_id, msg_type=ACPMsgType.DATA_SUBMIT, payload={"n": n}
+                ))
+
+
+class DropOldestAgent(EchoAgent):
+    """Echo agent that discards the oldest queued message on overflow."""
+
+    inbox_overflow = "drop_oldest"
+
+
+async def _connected_bus() -> RabbitMQBus:
+    bus = RabbitMQBus("amqp://test")
+    assert await bus.connect()
+    return bus
+
+
+async def _run_echo(agent_cls, burst: int):
+    bus = await _connected_bus()
+    agent = agent_cls("echo", bus, burst)
+    await agent.start()
+    try:
+        await agent.send_message(agent.create_message(
+            receiver_id="echo", msg_type=ACPMsgType.DATA_SUBMIT, payload={"n": 0}
+        ))
+        await asyncio.wait_for(agent.inbox.join(), timeout=5)
+        return agent
+    finally:
+        await agent.stop()
+        await bus.disconnect()
+
+
+def test_inline_overflow_handles_every_message_in_order():
+    agent = asyncio.run(_run_echo(EchoAgent, burst=50))
+
+    assert agent.received == list(range(51))
+    assert agent.dropped_messages == 0
+
+
+def test_drop_oldest_overflow_keeps_the_newest_messages():
+    agent = asyncio.run(_run_echo(DropOldestAgent, burst=50))
+
+    assert agent.received[0] == 0
+    assert agent.received[-agent.inbox_size:] == list(range(47, 51))
+    assert agent.dropped_messages == 50 - agent.inbox_size
+    assert len(agent.received) == 1 + agent.inbox_size
+
+
+class SlowAgent(AsyncBaseAgent):
+    """Agent whose handler for message 0 blocks until released."""
+
+    inbox_size = 2
+
+    def __init__(self, agent_id, message_bus):
+        super().__init__(agent_id, message_bus, {})
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.received = []
+        self.active = 0
+        self.max_active = 0
+
+    async def handle_message(self, message: ACPMessage):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            self.received.append(message.payload["n"])
+            if message.payload["n"] == 0:
+                self.started.set()
+                await self.release.wait()
+        finally:
+            self.active -= 1
+
+
+def test_inline_overflow_waits_for_the_consumer_handler():
+    async def scenario():
+        bus = await _connected_bus()
+        agent = SlowAgent("slow", bus)
+        await agent.start()
+        try:
+            async def send(n):
+                await agent.send_message(agent.create_message(
+                    receiver_id="slow", msg_type=ACPMsgType.DATA_SUBMIT, payload={"n": n}
+                ))
+
+            await send(0)
+            await agent.started.wait()
+            # Fill the inbox while the consumer is mid-handler, then overflow it
+            await send(1)
+            await send(2)
+            overflow = asyncio.create_task(send(3))
+            await asyncio.sleep(0.01)
+            handled_early = list(agent.received)
+            agent.release.set()
+            await asyncio.wait_for(overflow, timeout=5)
+            await asyncio.wait_for(agent.inbox.join(), timeout=5)
+            return agent, handled_early
+        finally:
+            await agent.stop()
+            await bus.disconnect()
+
+    agent, handled_early = asyncio.run(scenario())
+
+    assert handled_early == [0]
+    assert agent.received == [0, 1, 2, 3]
+    assert agent.max_active == 1
+
+
+async def _fake_call(self, server_name, tool_name, params):
+    if tool_name == "search_web":
+        results = [{"url": f"http://e{i}.test/p", "title": f"T{i}", "snippet": "s"} for i in range(5)]
+        return {"results": results, "query_processed": params["query"]}
+    if tool_name == "validate_path":
+        return {"is_allowed": True}
+    if tool_name == "save_file":
+        return {"success": True, "bytes_written": len(params["content"]), "file_path": params["file_path"]}
+    raise RuntimeError(f"unexpected tool {tool_name}")
+
+
+async def _fake_stream(self, server_name, tool_name, params, progress_callback=None):
+    # Stream the page in tiny chunks: far more deliveries than the orchestrator inbox holds
+    for i in range(0, len(CONTENT), 8):
+        await progress_callback({"chunk": CONTENT[i:i + 8]})
+    return {"url": params["url"], "title": "T", "content": CONTENT, "word_count": len(CONTENT.split())}
+
+
+async def _run_chunked_workflow():
+    bus = await _connected_bus()
+    agents = [
+        AsyncOrchestratorAgent("orchestrator", bus, MCP_SERVERS),
+        AsyncSearchAgent("search_agent", bus, MCP_SERVERS),
+        AsyncExtractionAgent("extraction_agent", bus, MCP_SERVERS),
+        AsyncSynthesisAgent("synthesis_agent", bus, MCP_SERVERS),
+        AsyncFileSaveAgent("file_save_agent", bus, MCP_SERVERS)
+    ]
+    for agent in agents:
+        agent.call_mcp_tool = _fake_call.__get__(agent)
+        agent.call_mcp_tool_streaming = _fake_stream.__get__(agent)
+
+    await asyncio.gather(*(agent.start() for agent in agents))
+    orchestrator = agents[0]
+    try:
+        await orchestrator.start_research("quantum cryptography")
+        while not orchestrator.synthesis_report:
+            await asyncio.sleep(0.01)
+        return orchestrator
+    finally:
+        await asyncio.gather(*(agent.stop() for agent in agents))
+        await bus.disconnect()
+
+
+def test_workflow_with_more_deliveries_than_inbox_size_completes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    orchestrator = asyncio.run(asyncio.wait_for(_run_chunked_workflow(), timeout=30))
+
+    assert len(CONTENT) // 8 > AsyncOrchestratorAgent.inbox_size
+    assert orchestrator.extracted_content
+    assert all(content["content"] == CONTENT for content in orchestrator.extracted_content)
+    assert orchestrator.content_chunks == {}
@@ -0,0 +1,71 @@
+"""
+Unit tests for AsyncBaseAgent configuration and background sends.
+"""
+
+import asyncio
+import logging
+
+from src.agents import AsyncBaseAgent
+from src.message_bus.rabbitmq_bus import RabbitMQBus
+
+
+class QuietAgent(AsyncBaseAgent):
+    """Minimal concrete agent."""
+
+    async def handle_message(self, message):
+        pass
+
+
+def test_log_broadcast_level_is_read_when_the_agent_is_created(monkeypatch):
+    monkeypatch.setenv("ACP_LOG_BROADCAST_LEVEL", "INFO")
+    verbose = QuietAgent("verbose", RabbitMQBus("amqp://test"), {})
+    monkeypatch.setenv("ACP_LOG_BROADCAST_LEVEL", "ERROR")
+    strict = QuietAgent("strict", RabbitMQBus("amqp://test"), {})
+
+    assert verbose.should_broadcast("INFO")
+    assert not strict.should_broadcast("WARNING")
+    assert strict.should_broadcast("ERROR")
+
+
+def test_class_level_broadcast_threshold_overrides_the_environment(monkeypatch):
+    class ErrorsOnlyAgent(QuietAgent):
+        log_broadcast_level = logging.ERROR
+
+    monkeypatch.setenv("ACP_LOG_BROADCAST_LEVEL", "DEBUG")
+    agent = ErrorsOnlyAgent("errors", RabbitMQBus("amqp://test"), {})
+
+    assert not agent.should_broadcast("WARNING")
+    assert agent.should_broadcast("ERROR")
+
+
+def test_invalid_broadcast_level_falls_back_to_warning(monkeypatch):
+    monkeypatch.setenv("ACP_LOG_BROADCAST_LEVEL", "chatty")
+    agent = QuietAgent("fallback", RabbitMQBus("amqp://test"), {})
+
+    assert not agent.should_broadcast("INFO")
+    assert agent.should_broadcast("WARNING")
+
+
+def test_background_send_cancelled_while_waiting_closes_its_coroutine():
+    async def scenario():
+        class SingleSlotAgent(QuietAgent):
+            background_send_limit = 1
+
+        agent = SingleSlotAgent("agent", RabbitMQBus("amqp://test"), {})
+        release = asyncio.Event()
+        await agent.send_in_background(release.wait())
+
+        pending = release.wait()
+        waiting = asyncio.create_task(agent.send_in_background(pending))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        release.set()
+        await asyncio.gather(*agent._background_tasks)
+        return waiting, pending
+
+    waiting, pending = asyncio.run(scenario())
+
+    assert waiting.cancelled()
+    # Closed without ever running, so no "never awaited" warning is raised
+    assert pending.cr_frame is None
@@ -0,0 +1,191 @@
+"""
+Unit tests for AsyncExtractionAgent helpers and its shared in-flight fetches.
+"""
+
+import asyncio
+
+import pytest
+
+from src.agents import AsyncExtractionAgent
+from src.agents.async_extraction_agent import _ProgressCoalescer, _normalize_url
+from src.message_bus.rabbitmq_bus import RabbitMQBus
+
+EVENTS = [{"chunk": "alpha "}, {"phase": "download", "percentage": 50}, {"chunk": "beta"}]
+
+
+def _agent() -> AsyncExtractionAgent:
+    return AsyncExtractionAgent("extraction_agent", RabbitMQBus("amqp://test"), {})
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Example.COM/Path/", "https://example.com/Path"),
+    ("https://example.com/a?utm_source=x&id=7&fbclid=abc", "https://example.com/a?id=7"),
+    ("https://example.com/a?UTM_Medium=x&gclid=1#section", "https://example.com/a"),
+    ("  https://example.com/a?b=&ref=home  ", "https://example.com/a?b="),
+    ("https://example.com/a?id=1&id=2", "https://example.com/a?id=1&id=2")
+])
+def test_normalize_url(url, expected):
+    assert _normalize_url(url) == expected
+
+
+def test_tracking_variants_share_a_cache_key():
+    assert _normalize_url("https://Example.com/post/?utm_campaign=x") == _normalize_url("https://example.com/post")
+
+
+def _run_coalescer(ticks):
+    """Feed ``(phase, status, percentage)`` ticks to a coalescer, then flush it."""
+    async def scenario():
+        sent = []
+
+        async def send(status, percentage):
+            sent.append((status, percentage))
+
+        coalescer = _ProgressCoalescer(send, min_delta=5.0, interval=60.0)
+        for tick in ticks:
+            await coalescer.update(*tick)
+        held = list(sent)
+        await coalescer.flush()
+        await coalescer.flush()
+        return held, sent
+
+    return asyncio.run(scenario())
+
+
+def test_coalescer_holds_small_ticks_and_flushes_the_latest_on_completion():
+    held, sent = _run_coalescer([
+        ("download", "downloading", 10.0),
+        ("download", "downloading", 11.0),
+        ("download", "downloading", 12.0)
+    ])
+
+    assert held == [("downloading", 10.0)]
+    # The terminal flush publishes only the newest held tick, exactly once
+    assert sent == [("downloading", 10.0), ("downloading", 12.0)]
+
+
+def test_coalescer_publishes_phase_changes_and_large_steps_immediately():
+    held, sent = _run_coalescer([
+        ("download", "downloading", 10.0),
+        ("parsing", "parsing", 11.0),
+        ("parsing", "parsing", 16.0)
+    ])
+
+    assert held == [("downloading", 10.0), ("parsing", 11.0), ("parsing", 16.0)]
+    assert sent == held
+
+
+def test_joined_fetch_replays_and_forwards_the_stream():
+    async def scenario():
+        agent = _agent()
+        calls = 0
+        joined = asyncio.Event()
+
+        async def fake_stream(server_name, tool_name, params, progress_callback=None):
+            nonlocal calls
+            calls += 1
+            await progress_callback(EVENTS[0])
+            await joined.wait()
+            for event in EVENTS[1:]:
+                await progress_callback(event)
+            return {"url": params["url"], "content": "alpha beta"}
+
+        agent.call_mcp_tool_streaming = fake_stream
+        first, second = [], []
+
+        async def record(events, progress_data):
+            events.append(progress_data)
+
+        async def first_caller():
+            return await agent._fetch_content("http://a.test/x", {"url": "http://a.test/x"},
+                                              lambda data: record(first, data))
+
+        async def second_caller():
+            # Join once the first chunk has already been streamed
+            while not first:
+                await asyncio.sleep(0)
+            fetch = agent._fetch_content("HTTP://A.test/x/", {"url": "HTTP://A.test/x/"},
+                                         lambda data: record(second, data))
+            task = asyncio.ensure_future(fetch)
+            await asyncio.sleep(0)
+            joined.set()
+            return await task
+
+        results = await asyncio.gather(first_caller(), second_caller())
+        return calls, results, first, second, agent
+
+    calls, results, first, second, agent = asyncio.run(scenario())
+
+    assert calls == 1
+    assert results[0] == results[1]
+    assert first == EVENTS
+    assert second == EVENTS
+    assert agent._inflight == {}
+
+
+def _blocking_stream(agent, release: asyncio.Event):
+    """Streaming stub that blocks until ``release`` is set, recording cancellation."""
+    agent.stream_cancelled = False
+
+    async def fake_stream(server_name, tool_name, params, progress_callback=None):
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            agent.stream_cancelled = True
+            raise
+        return {"url": params["url"], "content": "alpha beta"}
+
+    agent.call_mcp_tool_streaming = fake_stream
+
+
+async def _ignore(progress_data):
+    pass
+
+
+def test_cancelling_the_first_caller_leaves_the_fetch_to_the_joiner():
+    async def scenario():
+        agent = _agent()
+        release = asyncio.Event()
+        _blocking_stream(agent, release)
+        params = {"url": "http://a.test/x"}
+
+        owner = asyncio.create_task(agent._fetch_content("http://a.test/x", params, _ignore))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(agent._fetch_content("http://a.test/x", params, _ignore))
+        await asyncio.sleep(0)
+        owner.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        result = await joiner
+        return agent, owner, result, agent._content_cache.get("http://a.test/x")
+
+    agent, owner, result, cached = asyncio.run(scenario())
+
+    assert owner.cancelled()
+    assert not agent.stream_cancelled
+    assert result == {"url": "http://a.test/x", "content": "alpha beta"}
+    assert cached == result
+    assert agent._inflight == {}
+
+
+def test_fetch_is_cancelled_once_every_caller_has_left():
+    async def scenario():
+        agent = _agent()
+        _blocking_stream(agent, asyncio.Event())
+        params = {"url": "http://a.test/x"}
+
+        callers = [asyncio.create_task(agent._fetch_content("http://a.test/x", params, _ignore))
+                   for _ in range(2)]
+        await asyncio.sleep(0)
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        cancelled_early = agent.stream_cancelled
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return agent, cancelled_early
+
+    agent, cancelled_early = asyncio.run(scenario())
+
+    assert not cancelled_early
+    assert agent.stream_cancelled
+    assert agent._inflight == {}
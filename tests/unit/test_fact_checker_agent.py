@@ -0,0 +1,41 @@
+"""
+Unit tests for AsyncFactCheckerAgent claim detection.
+"""
+
+import asyncio
+
+import pytest
+
+from src.agents.async_fact_checker_agent import CLAIM_INDICATORS, _CLAIM_RE, AsyncFactCheckerAgent
+from src.message_bus.rabbitmq_bus import RabbitMQBus
+
+
+@pytest.mark.parametrize("sentence", [
+    "Quantum computers threaten RSA",
+    "NEW ALGORITHMS were published",
+    "The standard comes from NIST",
+    "The administration announced a budget",
+    "According To the report, nothing changed",
+    "Nothing here looks like a claim"
+])
+def test_claim_regex_matches_the_lowercased_substring_check(sentence):
+    expected = any(indicator in sentence.lower() for indicator in CLAIM_INDICATORS)
+
+    assert bool(_CLAIM_RE.search(sentence)) == expected
+
+
+def test_extract_claims_keeps_substantial_indicator_sentences():
+    agent = AsyncFactCheckerAgent("fact_checker_agent", RabbitMQBus("amqp://test"), {})
+    content = (
+        "Quantum key distribution was demonstrated over long distances. "
+        "The administration reviewed the NIST budget at length. "
+        "Short quantum note. "
+        "Studies indicate that lattice schemes resist known attacks"
+    )
+
+    claims = asyncio.run(agent._extract_claims_from_content(content))
+
+    assert claims == [
+        "Quantum key distribution was demonstrated over long distances",
+        "Studies indicate that lattice schemes resist known attacks"
+    ]
@@ -0,0 +1,119 @@
+"""
+Unit tests for AsyncFileSaveAgent path-validation caching.
+"""
+
+import asyncio
+
+from src.agents import AsyncFileSaveAgent
+from src.message_bus.rabbitmq_bus import RabbitMQBus
+
+
+def _agent(verdicts):
+    """File save agent whose validate_path calls pop results from ``verdicts``."""
+    agent = AsyncFileSaveAgent("file_save_agent", RabbitMQBus("amqp://test"), {})
+    agent.validated = []
+    agent.active = agent.max_active = 0
+
+    async def fake_call(server_name, tool_name, params):
+        assert tool_name == "validate_path"
+        agent.validated.append(params["path"])
+        agent.active += 1
+        agent.max_active = max(agent.max_active, agent.active)
+        try:
+            await asyncio.sleep(0)
+            verdict = verdicts.pop(0)
+        finally:
+            agent.active -= 1
+        if isinstance(verdict, Exception):
+            raise verdict
+        return verdict
+
+    agent.call_mcp_tool = fake_call
+    return agent
+
+
+def test_verdict_is_reused_for_the_same_directory():
+    agent = _agent([
+        {"is_allowed": True, "path": "output/reports/a.md", "resolved_path": "/srv/output/reports/a.md"},
+        {"is_allowed": False}
+    ])
+
+    async def scenario():
+        return [
+            await agent._validate_file_path("output/reports/a.md"),
+            await agent._validate_file_path("output/reports/b.md"),
+            await agent._validate_file_path("output/other/c.md")
+        ]
+
+    results = asyncio.run(scenario())
+
+    assert [result["is_allowed"] for result in results] == [True, True, False]
+    assert agent.validated == ["output/reports/a.md", "output/other/c.md"]
+    # The second file gets the directory verdict, not the first file's details
+    assert results[1] == {"is_allowed": True}
+
+
+def test_concurrent_saves_share_one_validation_call():
+    agent = _agent([{"is_allowed": True}])
+
+    async def scenario():
+        return await asyncio.gather(*(
+            agent._validate_file_path(f"output/reports/{i}.md") for i in range(5)
+        ))
+
+    results = asyncio.run(scenario())
+
+    assert all(result["is_allowed"] for result in results)
+    assert len(agent.validated) == 1
+    assert agent._path_validation_locks == {}
+    assert agent._path_validation_users == {}
+
+
+def test_late_callers_wait_on_the_same_lock():
+    agent = _agent([{"is_allowed": True}] * 4)
+    # Nothing is cached, so every caller validates while holding the lock
+    agent.path_validation_ttl = 0
+
+    async def scenario():
+        waiting = [asyncio.create_task(agent._validate_file_path(f"output/reports/{i}.md")) for i in range(3)]
+        await waiting[0]
+        # Arrives after the first holder released the lock while the others still wait on it
+        late = agent._validate_file_path("output/reports/late.md")
+        return await asyncio.gather(late, *waiting[1:])
+
+    results = asyncio.run(scenario())
+
+    assert all(result["is_allowed"] for result in results)
+    assert len(agent.validated) == 4
+    assert agent.max_active == 1
+    assert agent._path_validation_locks == {}
+
+
+def test_verdicts_expire_after_the_ttl():
+    agent = _agent([{"is_allowed": True}, {"is_allowed": False}])
+    agent.path_validation_ttl = 0.01
+
+    async def scenario():
+        first = await agent._validate_file_path("output/reports/a.md")
+        await asyncio.sleep(0.02)
+        return first, await agent._validate_file_path("output/reports/a.md")
+
+    first, second = asyncio.run(scenario())
+
+    assert first["is_allowed"] and not second["is_allowed"]
+    assert len(agent.validated) == 2
+
+
+def test_failed_validation_is_not_cached():
+    agent = _agent([RuntimeError("filesystem server down"), {"is_allowed": True}])
+
+    async def scenario():
+        return [
+            await agent._validate_file_path("output/reports/a.md"),
+            await agent._validate_file_path("output/reports/a.md")
+        ]
+
+    failed, retried = asyncio.run(scenario())
+
+    assert not failed["is_allowed"] and "error" in failed
+    assert retried["is_allowed"]
@@ -0,0 +1,74 @@
+"""
+Unit tests for AsyncOrchestratorAgent result handling.
+
+Data submissions are fed straight into the handlers, so no other agent runs.
+"""
+
+import asyncio
+
+from src.agents import AsyncOrchestratorAgent
+from src.message_bus.rabbitmq_bus import RabbitMQBus
+
+
+def _orchestrator() -> AsyncOrchestratorAgent:
+    return AsyncOrchestratorAgent("orchestrator", RabbitMQBus("amqp://test"), {})
+
+
+def _chunk(url: str, index: int, text: str) -> dict:
+    return {"url": url, "content_chunk": text, "chunk_index": index, "last_chunk": False}
+
+
+def test_chunks_are_reassembled_when_the_server_reports_a_redirected_url():
+    async def scenario():
+        orchestrator = _orchestrator()
+        orchestrator._buffer_content_chunk(_chunk("http://a.test/page", 1, "world"))
+        orchestrator._buffer_content_chunk(_chunk("http://a.test/page", 0, "hello "))
+        await orchestrator._handle_extracted_content({
+            "url": "https://www.a.test/page/",
+            "source_url": "http://a.test/page",
+            "content": "",
+            "extraction_successful": True,
+            "last_chunk": True
+        }, "extraction_agent")
+        return orchestrator
+
+    orchestrator = asyncio.run(scenario())
+
+    assert orchestrator.extracted_content[0]["content"] == "hello world"
+    assert orchestrator.content_chunks == {}
+
+
+def test_failed_extraction_drops_its_buffered_chunks():
+    async def scenario():
+        orchestrator = _orchestrator()
+        orchestrator._buffer_content_chunk(_chunk("http://a.test/page", 0, "partial"))
+        await orchestrator._handle_extracted_content({
+            "url": "http://a.test/page",
+            "source_url": "http://a.test/page",
+            "content": "",
+            "extraction_successful": False
+        }, "extraction_agent")
+        return orchestrator
+
+    orchestrator = asyncio.run(scenario())
+
+    assert orchestrator.extracted_content[0]["content"] == ""
+    assert orchestrator.content_chunks == {}
+
+
+def test_extraction_latency_is_recorded_for_a_redirected_url():
+    async def scenario():
+        orchestrator = _orchestrator()
+        orchestrator._extraction_started_at["http://a.test/page"] = 0.0
+        await orchestrator._handle_extracted_content({
+            "url": "https://www.b.test/landing",
+            "source_url": "http://a.test/page",
+            "content": "text",
+            "extraction_successful": True
+        }, "extraction_agent")
+        return orchestrator
+
+    orchestrator = asyncio.run(scenario())
+
+    assert orchestrator._extraction_started_at == {}
+    assert set(orchestrator._domain_latency) == {"a.test"}
@@ -0,0 +1,57 @@
+"""
+Unit tests for the performance test script's response-time summary.
+
+The script lives outside the ``src`` package, so it is loaded from its path.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "performance_test.py"
+
+
+@pytest.fixture(scope="module")
+def performance_test():
+    spec = importlib.util.spec_from_file_location("performance_test", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # numba's on-disk cache re-imports the defining module by name
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    yield module
+    sys.modules.pop(spec.name, None)
+
+
+def _reference(values):
+    """Summary computed the plain way, from a fully sorted list."""
+    ordered = sorted(values)
+    return sum(ordered) / len(ordered), ordered[0], ordered[-1], ordered[int(0.95 * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize("size", [1, 2, 19, 20, 21, 1000])
+def test_summary_matches_a_sorted_list(performance_test, size):
+    values = np.random.default_rng(size).exponential(0.2, size)
+
+    summary = performance_test.summarize_response_times(values)
+
+    assert summary == pytest.approx(_reference(values.tolist()))
+
+
+def test_summary_of_a_large_sample_matches_a_sorted_list(performance_test):
+    # Large enough to take the compiled path when numba is installed
+    values = np.random.default_rng(7).exponential(0.2, performance_test.JIT_SUMMARY_THRESHOLD)
+
+    summary = performance_test.summarize_response_times(values)
+
+    assert summary == pytest.approx(_reference(values.tolist()))
+
+
+def test_summary_does_not_reorder_the_input(performance_test):
+    values = np.array([0.5, 0.1, 0.9, 0.3])
+
+    performance_test.summarize_response_times(values)
+
+    assert values.tolist() == [0.5, 0.1, 0.9, 0.3]
@@ -0,0 +1,127 @@
+"""
+Unit tests for the RabbitMQBus in-process routing.
+"""
+
+import asyncio
+
+import orjson
+import pytest
+
+from src.message_bus.rabbitmq_bus import RabbitMQBus
+from src.protocols.acp_schema import ACPMessage, ACPMsgType
+
+
+async def _connected_bus() -> RabbitMQBus:
+    bus = RabbitMQBus("amqp://test")
+    assert await bus.connect()
+    return bus
+
+
+async def _ignore(message):
+    pass
+
+
+def test_prefetch_is_applied_per_agent_channel():
+    async def scenario():
+        bus = await _connected_bus()
+        await bus.subscribe_agent("extraction_agent", _ignore, prefetch_count=4)
+        await bus.subscribe_agent("fact_checker_agent", _ignore, prefetch_count=2)
+        await bus.subscribe_agent("search_agent", _ignore)
+        channels = dict(bus.agent_channels)
+        await bus.unsubscribe_agent("extraction_agent")
+        return bus, channels
+
+    bus, channels = asyncio.run(scenario())
+
+    assert channels["extraction_agent"].prefetch_count == 4
+    assert channels["fact_checker_agent"].prefetch_count == 2
+    assert channels["extraction_agent"] is not channels["fact_checker_agent"]
+    assert "search_agent" not in channels
+    assert bus.channel.prefetch_count == 0
+    assert set(bus.agent_channels) == {"fact_checker_agent"}
+
+
+def test_unsubscribing_forgets_coroutine_callbacks():
+    async def scenario():
+        bus = await _connected_bus()
+        await bus.subscribe_agent("logger_agent", _ignore)
+        await bus.subscribe_topic("logs", _ignore)
+        await bus.unsubscribe_agent("logger_agent")
+        still_known = _ignore in bus._coroutine_callbacks
+        await bus.unsubscribe_topic("logs", _ignore)
+        return bus, still_known
+
+    bus, still_known = asyncio.run(scenario())
+
+    # The topic subscription keeps the callback awaited until it is dropped too
+    assert still_known
+    assert bus._coroutine_callbacks == {}
+    assert bus.topic_subscribers == {}
+
+
+def _recorder(received, name):
+    async def callback(message):
+        received.append((name, message))
+    return callback
+
+
+def test_publish_batch_routes_direct_and_topic_messages():
+    async def scenario():
+        bus = await _connected_bus()
+        received = []
+        await bus.subscribe_agent("extraction_agent", _recorder(received, "extraction"))
+        await bus.subscribe_topic("logs", _recorder(received, "logs"))
+        await bus.publish_batch([
+            ACPMessage(sender_id="orchestrator", receiver_id="extraction_agent",
+                       msg_type=ACPMsgType.TASK_ASSIGN, payload={"task_type": "extract_content"}),
+            ACPMessage(sender_id="orchestrator", topic="logs",
+                       msg_type=ACPMsgType.LOG_BROADCAST, payload={"level": "INFO", "message": "hi"}),
+            ACPMessage(sender_id="orchestrator", receiver_id="nobody",
+                       msg_type=ACPMsgType.TASK_ASSIGN, payload={})
+        ])
+        return received
+
+    received = asyncio.run(scenario())
+
+    assert [(name, message.msg_type) for name, message in received] == [
+        ("extraction", ACPMsgType.TASK_ASSIGN),
+        ("logs", ACPMsgType.LOG_BROADCAST)
+    ]
+    assert received[0][1].payload == {"task_type": "extract_content"}
+
+
+def test_publish_raw_delivers_a_pre_encoded_body():
+    body = orjson.dumps({
+        "sender_id": "synthesis_agent",
+        "receiver_id": "orchestrator",
+        "topic": None,
+        "msg_type": "data_submit",
+        "payload": {"data_type": "synthesis_report", "data": {"word_count": 3}},
+        "timestamp": None
+    })
+
+    async def scenario():
+        bus = await _connected_bus()
+        received = []
+        await bus.subscribe_agent("orchestrator", _recorder(received, "orchestrator"))
+        await bus.publish_raw(body, receiver_id="orchestrator")
+        return received
+
+    received = asyncio.run(scenario())
+
+    assert len(received) == 1
+    message = received[0][1]
+    assert message.sender_id == "synthesis_agent"
+    assert message.msg_type == ACPMsgType.DATA_SUBMIT
+    assert message.payload["data"] == {"word_count": 3}
+
+
+def test_publish_raw_requires_a_route_and_a_connection():
+    async def scenario():
+        bus = await _connected_bus()
+        with pytest.raises(ValueError):
+            await bus.publish_raw(b"{}")
+        with pytest.raises(RuntimeError):
+            await RabbitMQBus("amqp://test").publish_raw(b"{}", receiver_id="orchestrator")
+
+    asyncio.run(scenario())
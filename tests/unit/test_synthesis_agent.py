@@ -0,0 +1,57 @@
+"""
+Unit tests for AsyncSynthesisAgent status-update buffering.
+"""
+
+import asyncio
+import logging
+
+from src.agents import AsyncSynthesisAgent
+from src.message_bus.rabbitmq_bus import RabbitMQBus
+
+
+def _agent(fail: bool = False) -> AsyncSynthesisAgent:
+    """Synthesis agent whose status updates are recorded instead of published."""
+    agent = AsyncSynthesisAgent("synthesis_agent", RabbitMQBus("amqp://test"), {})
+    agent.status_flush_interval = 0.01
+    agent.published = []
+
+    async def fake_publish(receiver_id, status, progress=None, task_id=None):
+        if fail:
+            raise RuntimeError("bus down")
+        agent.published.append((task_id, status, progress))
+
+    agent.publish_status_update = fake_publish
+    return agent
+
+
+def test_a_terminal_status_keeps_other_tasks_buffered_updates():
+    agent = _agent()
+
+    async def scenario():
+        await agent._send_status_update("synthesis_started", 10.0, "task-a")
+        await agent._send_status_update("synthesis_started", 10.0, "task-b")
+        await agent._send_status_update("generating_report", 60.0, "task-a")
+        await agent._send_status_update("synthesis_complete", 100.0, "task-b")
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+
+    assert agent.published == [
+        ("task-b", "synthesis_complete", 100.0),
+        ("task-a", "generating_report", 60.0)
+    ]
+    assert agent._pending_status == {}
+
+
+def test_a_failed_flush_is_logged(caplog):
+    agent = _agent(fail=True)
+
+    async def scenario():
+        await agent._send_status_update("synthesis_started", 10.0, "task-a")
+        await asyncio.sleep(0.05)
+
+    with caplog.at_level(logging.ERROR):
+        asyncio.run(scenario())
+
+    assert "Buffered status update failed: bus down" in caplog.text
+    assert agent._status_flush_task is None
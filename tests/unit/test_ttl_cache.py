@@ -0,0 +1,57 @@
+"""
+Unit tests for the agents' shared TTL/LRU cache.
+"""
+
+import asyncio
+
+from src.agents._ttl_cache import TTLCache
+
+
+def _with_clock(scenario):
+    """Run ``scenario(clock)`` on a loop whose time() is driven by the test."""
+    async def runner():
+        clock = [1000.0]
+        asyncio.get_running_loop().time = lambda: clock[0]
+        return scenario(clock)
+
+    return asyncio.run(runner())
+
+
+def test_entries_expire_after_ttl():
+    def scenario(clock):
+        cache = TTLCache(maxsize=4, ttl=10.0)
+        cache.set("query", "results")
+        clock[0] += 9.9
+        fresh = cache.get("query")
+        clock[0] += 0.1
+        return fresh, cache.get("query"), len(cache._entries)
+
+    fresh, expired, remaining = _with_clock(scenario)
+
+    assert fresh == "results"
+    assert expired is None
+    assert remaining == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    def scenario(clock):
+        cache = TTLCache(maxsize=2, ttl=60.0)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now the least recently used
+        cache.set("c", 3)
+        return cache.get("a"), cache.get("b"), cache.get("c")
+
+    assert _with_clock(scenario) == (1, None, 3)
+
+
+def test_setting_an_existing_key_refreshes_its_expiry():
+    def scenario(clock):
+        cache = TTLCache(maxsize=2, ttl=10.0)
+        cache.set("a", 1)
+        clock[0] += 8
+        cache.set("a", 2)
+        clock[0] += 8
+        return cache.get("a")
+
+    assert _with_clock(scenario) == 2